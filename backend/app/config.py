@@ -2,6 +2,7 @@
 
 import tempfile
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -21,6 +22,8 @@ class Settings(BaseSettings):
     docker_memory_limit: str = "4g"
     docker_network_mode: str = "none"  # "none" (default) or "bridge" with allowlist
     docker_readonly_rootfs: bool = True  # Read-only root filesystem when viable
+    docker_build_cache_image: str = "arandu-job-cache:latest"  # Kept across jobs for layer cache
+    docker_max_parallel_builds: int = 2  # Concurrent image builds per host, across worker processes
 
     # Execution
     default_timeout_seconds: int = 1800  # 30 minutes
@@ -48,6 +51,7 @@ class Settings(BaseSettings):
     max_pdf_size_mb: int = 25
     review_timeout_seconds: int = 90
     pdf_parsing_timeout_seconds: int = 30
+    metrics_enabled: bool = True  # Set METRICS_ENABLED=false to skip in-memory metrics recording
 
     # Papers storage
     papers_base_path: Path = Path(tempfile.gettempdir()) / "arandu" / "papers"
@@ -56,6 +60,19 @@ class Settings(BaseSettings):
     crossref_enabled: bool = True
     crossref_mailto: str = "contact@arandu.org"  # For Crossref API
     rag_embedding_model: str = "all-MiniLM-L6-v2"  # Embedding model for RAG
+    # Inference backend for the embedding model: torch, onnx or openvino (onnx/openvino need
+    # sentence-transformers>=3.2 installed with the matching extra, e.g. sentence-transformers[onnx])
+    rag_embedding_backend: Literal["torch", "onnx", "openvino"] = "torch"
+    # Optional model file for the onnx/openvino backend, e.g. "onnx/model_qint8_avx512_vnni.onnx"
+    # for the INT8-quantized all-MiniLM-L6-v2 shipped on the Hugging Face Hub
+    rag_embedding_model_file: str = ""
+    # Inference backend for the cross-encoder reranker: torch, onnx or openvino (onnx/openvino need
+    # sentence-transformers>=4.1 with the matching extra; older versions fall back to torch).
+    # Only with onnx, RAG_RERANKER_ONNX_PROVIDER picks the ONNX Runtime provider (e.g.
+    # CUDAExecutionProvider, or TensorrtExecutionProvider for FP16 TensorRT engines cached under
+    # artifacts_base_path/rag/trt)
+    rag_reranker_backend: Literal["torch", "onnx", "openvino"] = "torch"
+    rag_reranker_onnx_provider: str = ""
     rag_dense_weight: float = 0.5  # Weight for dense search in hybrid (1-alpha for BM25)
     rag_top_k: int = 5  # Number of citations to return per claim
     rag_min_score: float = 0.3  # Minimum score threshold
@@ -48,6 +48,9 @@ class JSONFormatter(logging.Formatter):
         "error",
     }
 
+    # Fields never copied as custom extras (computed once, not per record)
+    _EXCLUDED_ATTRS = frozenset(_STANDARD_ATTRS | _STRUCTURED_FIELDS)
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
@@ -72,7 +75,7 @@ class JSONFormatter(logging.Formatter):
             log_data["error"] = record.error
 
         # Add any extra custom fields (exclude standard and structured fields)
-        excluded = self._STANDARD_ATTRS | self._STRUCTURED_FIELDS
+        excluded = self._EXCLUDED_ATTRS
         for key, value in record.__dict__.items():
             if key not in excluded:
                 log_data[key] = value
@@ -6,6 +6,8 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 # In-memory metrics store (in production, use Prometheus/StatsD)
@@ -16,6 +18,12 @@ _metrics: dict[str, Any] = defaultdict(lambda: {
     "last_updated": None,
 })
 
+# Step timings kept as parallel arrays indexed by step name, so the summary does
+# not have to scan every metric key to find the steps
+_step_index: dict[str, int] = {}
+_step_counts: list[int] = []
+_step_total_times: list[float] = []
+
 
 @dataclass
 class ReviewMetrics:
@@ -39,9 +47,17 @@ def record_step_time(step: str, duration: float):
         step: Step name (e.g., "ingestion", "claim_extraction")
         duration: Duration in seconds
     """
-    _metrics[f"step_{step}"]["count"] += 1
-    _metrics[f"step_{step}"]["total_time"] += duration
-    _metrics[f"step_{step}"]["last_updated"] = time.time()
+    if not settings.metrics_enabled:
+        return
+
+    idx = _step_index.get(step)
+    if idx is None:
+        idx = _step_index[step] = len(_step_counts)
+        _step_counts.append(0)
+        _step_total_times.append(0.0)
+
+    _step_counts[idx] += 1
+    _step_total_times[idx] += duration
 
 
 def record_review_metrics(metrics: ReviewMetrics):
@@ -51,6 +67,9 @@ def record_review_metrics(metrics: ReviewMetrics):
     Args:
         metrics: ReviewMetrics object
     """
+    if not settings.metrics_enabled:
+        return
+
     # Overall review metrics
     _metrics["reviews_total"]["count"] += 1
     _metrics["reviews_total"]["total_time"] += metrics.total_time
@@ -115,16 +134,14 @@ def get_metrics_summary() -> dict[str, Any]:
         }
 
     # Step times
-    step_metrics = {}
-    for key, value in _metrics.items():
-        if key.startswith("step_") and value["count"] > 0:
-            step_name = key.replace("step_", "")
-            step_metrics[step_name] = {
-                "avg_time_seconds": value["total_time"] / value["count"],
-                "count": value["count"],
+    if _step_index:
+        summary["steps"] = {
+            step_name: {
+                "avg_time_seconds": _step_total_times[idx] / _step_counts[idx],
+                "count": _step_counts[idx],
             }
-    if step_metrics:
-        summary["steps"] = step_metrics
+            for step_name, idx in _step_index.items()
+        }
 
     return summary
 
@@ -133,4 +150,7 @@ def reset_metrics():
     """Reset all metrics (for testing)."""
     global _metrics
     _metrics.clear()
+    _step_index.clear()
+    _step_counts.clear()
+    _step_total_times.clear()
 
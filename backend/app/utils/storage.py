@@ -48,11 +48,10 @@ def get_paper_version_path(aid: str, version: int, filename: str = "file.pdf") -
     # Construct path: /papers/{aid}/v{version}/{filename}
     path = Path("papers") / aid / f"v{version}" / filename
 
-    # Resolve to ensure no traversal
-    resolved = (Path("/") / path).resolve()
-    base_resolved = Path("/") / Path("papers")
-
-    if not str(resolved).startswith(str(base_resolved)):
+    # Components are validated above, so a pure string normalization is enough
+    # to catch traversal (no filesystem lookups needed)
+    path_str = str(path)
+    if os.path.normpath(path_str) != path_str or not path_str.startswith("papers" + os.sep):
         raise ValueError(f"Path traversal detected: {path}")
 
     return path
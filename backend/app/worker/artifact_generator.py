@@ -12,6 +12,72 @@ from app.worker.env_detector import EnvironmentInfo
 
 logger = logging.getLogger(__name__)
 
+# Job status -> (badge label, shields.io color)
+_BADGE_STATUS_MAP = {
+    "completed": ("Reproducible", "green"),
+    "failed": ("Failed", "red"),
+    "running": ("Running", "yellow"),
+}
+_BADGE_STATUS_DEFAULT = ("Pending", "gray")
+
+# Static lines of the notebook "Environment Setup" cell
+_SETUP_SOURCE_HEADER = ("# Environment Setup\n", "\n")
+_SETUP_SOURCE_CONDA = (
+    "```bash\n",
+    "conda env create -f environment.yml\n",
+    "conda activate <env-name>\n",
+    "```\n",
+)
+
+_REPORT_HEADER_TEMPLATE = """# Reproducibility Report
+
+**Generated:** {generated}
+
+## Job Metadata
+
+- **Job ID:** `{job_id}`
+- **Repository:** {repo_url}
+- **Status:** {status}
+- **Created:** {created_at}
+- **Started:** {started_at}
+- **Completed:** {completed_at}
+- **Duration:** {duration}"""
+
+_REPORT_ENVIRONMENT_TEMPLATE = """
+## Environment Summary
+
+- **Type:** {env_type}
+- **Base Image:** {base_image}
+- **Detected Files:** {detected_files}
+
+### Dependencies
+"""
+
+_REPORT_STDOUT_HEADER = """
+## Logs
+
+### Standard Output
+
+```"""
+
+_REPORT_STDERR_HEADER = """```
+
+### Standard Error
+
+```"""
+
+_REPORT_FOOTER_TEMPLATE = """```
+
+---
+
+*Full logs available at: {logs_path}*"""
+
+_REPORT_FOOTER_TEMPLATE_NO_LOGS = """```
+
+---
+
+"""
+
 
 def generate_report(
     job: Job,
@@ -19,7 +85,7 @@ def generate_report(
     env_info: EnvironmentInfo,
     output_path: Path,
     job_id: str,
-) -> Path:
+) -> tuple[Path, int]:
     """
     Generate reproducibility report in markdown format.
 
@@ -31,7 +97,7 @@ def generate_report(
         job_id: Job ID for logging
 
     Returns:
-        Path to generated report file
+        Path to generated report file and its size in bytes
     """
     with log_step(job_id, "generate_report"):
         output_path.mkdir(parents=True, exist_ok=True)
@@ -54,114 +120,74 @@ def generate_report(
         completed_at = run.completed_at.isoformat() if run.completed_at else "N/A"
         duration = f"{run.duration_seconds:.2f}s" if run.duration_seconds else "N/A"
 
-        # Build report content
-        report_lines = [
-            "# Reproducibility Report",
-            "",
-            f"**Generated:** {datetime.now(UTC).isoformat()}",
-            "",
-            "## Job Metadata",
-            "",
-            f"- **Job ID:** `{job.id}`",
-            f"- **Repository:** {job.repo_url}",
-            f"- **Status:** {status}",
-            f"- **Created:** {created_at}",
-            f"- **Started:** {started_at}",
-            f"- **Completed:** {completed_at}",
-            f"- **Duration:** {duration}",
+        # Fixed-structure sections are rendered from templates; only the
+        # variable-length parts (optional lines, dependencies, logs) are appended
+        report_parts = [
+            _REPORT_HEADER_TEMPLATE.format_map(
+                {
+                    "generated": datetime.now(UTC).isoformat(),
+                    "job_id": job.id,
+                    "repo_url": job.repo_url,
+                    "status": status,
+                    "created_at": created_at,
+                    "started_at": started_at,
+                    "completed_at": completed_at,
+                    "duration": duration,
+                }
+            )
         ]
 
         if job.arxiv_id:
-            report_lines.append(f"- **arXiv ID:** {job.arxiv_id}")
+            report_parts.append(f"- **arXiv ID:** {job.arxiv_id}")
 
         if job.run_command:
-            report_lines.append(f"- **Command:** `{job.run_command}`")
-
-        report_lines.extend(
-            [
-                "",
-                "## Environment Summary",
-                "",
-                f"- **Type:** {env_info.type}",
-                f"- **Base Image:** {env_info.base_image}",
-                f"- **Detected Files:** {', '.join(env_info.detected_files)}",
-                "",
-                "### Dependencies",
-                "",
-            ]
+            report_parts.append(f"- **Command:** `{job.run_command}`")
+
+        report_parts.append(
+            _REPORT_ENVIRONMENT_TEMPLATE.format_map(
+                {
+                    "env_type": env_info.type,
+                    "base_image": env_info.base_image,
+                    "detected_files": ", ".join(env_info.detected_files),
+                }
+            )
         )
 
         if env_info.dependencies:
-            for dep in env_info.dependencies:
-                formatted = dep.format_for_pip()
-                report_lines.append(f"- `{formatted}`")
+            report_parts.extend(f"- `{dep.format_for_pip()}`" for dep in env_info.dependencies)
         else:
-            report_lines.append("- No dependencies detected")
+            report_parts.append("- No dependencies detected")
 
-        report_lines.extend(
-            [
-                "",
-                "## Execution Results",
-                "",
-                f"**Status:** {status_emoji} {status}",
-            ]
-        )
+        report_parts.append(f"\n## Execution Results\n\n**Status:** {status_emoji} {status}")
 
         if run.exit_code is not None:
-            report_lines.append(f"**Exit Code:** {run.exit_code}")
+            report_parts.append(f"**Exit Code:** {run.exit_code}")
 
         if run.duration_seconds:
-            report_lines.append(f"**Duration:** {run.duration_seconds:.2f} seconds")
-
-        report_lines.extend(
-            [
-                "",
-                "## Logs",
-                "",
-                "### Standard Output",
-                "",
-                "```",
-            ]
-        )
-
-        # Add stdout (truncated)
-        if run.stdout:
-            report_lines.append(run.stdout)
-        else:
-            report_lines.append("(no output)")
+            report_parts.append(f"**Duration:** {run.duration_seconds:.2f} seconds")
 
-        report_lines.extend(
+        # Logs may be large: splice them in as-is so they are copied only once,
+        # by the final join
+        report_parts.extend(
             [
-                "```",
-                "",
-                "### Standard Error",
-                "",
-                "```",
-            ]
-        )
-
-        # Add stderr (truncated)
-        if run.stderr:
-            report_lines.append(run.stderr)
-        else:
-            report_lines.append("(no errors)")
-
-        report_lines.extend(
-            [
-                "```",
-                "",
-                "---",
-                "",
-                f"*Full logs available at: {run.logs_path}*" if run.logs_path else "",
+                _REPORT_STDOUT_HEADER,
+                run.stdout or "(no output)",
+                _REPORT_STDERR_HEADER,
+                run.stderr or "(no errors)",
+                (
+                    _REPORT_FOOTER_TEMPLATE.format_map({"logs_path": run.logs_path})
+                    if run.logs_path
+                    else _REPORT_FOOTER_TEMPLATE_NO_LOGS
+                ),
             ]
         )
 
         # Write report
-        report_content = "\n".join(report_lines)
-        report_file.write_text(report_content, encoding="utf-8")
+        report_content = "\n".join(report_parts)
+        report_size = report_file.write_bytes(report_content.encode("utf-8"))
 
-        logger.info(f"Generated report at {report_file}")
-        return report_file
+        logger.info("Generated report at %s", report_file)
+        return report_file, report_size
 
 
 def generate_notebook(
@@ -169,7 +195,7 @@ def generate_notebook(
     env_info: EnvironmentInfo,
     output_path: Path,
     job_id: str,
-) -> Path:
+) -> tuple[Path, int]:
     """
     Generate Jupyter notebook template.
 
@@ -180,7 +206,7 @@ def generate_notebook(
         job_id: Job ID for logging
 
     Returns:
-        Path to generated notebook file
+        Path to generated notebook file and its size in bytes
     """
     with log_step(job_id, "generate_notebook"):
         output_path.mkdir(parents=True, exist_ok=True)
@@ -204,18 +230,18 @@ def generate_notebook(
         )
 
         # Cell 2: Environment setup
-        setup_source = ["# Environment Setup\n", "\n"]
-        if env_info.type == "pip":
-            deps = [dep.format_for_pip() for dep in env_info.dependencies]
-            if deps:
-                setup_source.append("```bash\n")
-                setup_source.append("pip install " + " ".join(deps) + "\n")
-                setup_source.append("```\n")
+        if env_info.type == "pip" and env_info.dependencies:
+            pip_line = " ".join([dep.format_for_pip() for dep in env_info.dependencies])
+            setup_source = [
+                *_SETUP_SOURCE_HEADER,
+                "```bash\n",
+                f"pip install {pip_line}\n",
+                "```\n",
+            ]
         elif env_info.type == "conda":
-            setup_source.append("```bash\n")
-            setup_source.append("conda env create -f environment.yml\n")
-            setup_source.append("conda activate <env-name>\n")
-            setup_source.append("```\n")
+            setup_source = [*_SETUP_SOURCE_HEADER, *_SETUP_SOURCE_CONDA]
+        else:
+            setup_source = list(_SETUP_SOURCE_HEADER)
 
         cells.append(
             {
@@ -259,11 +285,13 @@ def generate_notebook(
             "nbformat_minor": 4,
         }
 
-        # Write notebook
-        notebook_file.write_text(json.dumps(notebook, indent=2), encoding="utf-8")
+        # Write notebook (compact: Jupyter does not need the indentation)
+        notebook_size = notebook_file.write_bytes(
+            json.dumps(notebook, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
 
-        logger.info(f"Generated notebook at {notebook_file}")
-        return notebook_file
+        logger.info("Generated notebook at %s", notebook_file)
+        return notebook_file, notebook_size
 
 
 def generate_badge(
@@ -271,7 +299,7 @@ def generate_badge(
     base_url: str,
     output_path: Path,
     job_id: str,
-) -> Path:
+) -> tuple[Path, int]:
     """
     Generate badge snippet in markdown format.
 
@@ -282,33 +310,20 @@ def generate_badge(
         job_id: Job ID for logging
 
     Returns:
-        Path to generated badge file
+        Path to generated badge file and its size in bytes
     """
     with log_step(job_id, "generate_badge"):
         output_path.mkdir(parents=True, exist_ok=True)
         badge_file = output_path / "badge.md"
 
-        # Determine badge status and color
-        if job.status.value == "completed":
-            status_text = "Reproducible"
-            color = "green"
-        elif job.status.value == "failed":
-            status_text = "Failed"
-            color = "red"
-        elif job.status.value == "running":
-            status_text = "Running"
-            color = "yellow"
-        else:
-            status_text = "Pending"
-            color = "gray"
-
-        job_url = f"{base_url}/jobs/{job.id}"
-        badge_url = f"https://img.shields.io/badge/Reproducibility-{status_text}-{color}"
-
-        badge_markdown = f"[![{status_text}]({badge_url})]({job_url})"
+        status_text, color = _BADGE_STATUS_MAP.get(job.status.value, _BADGE_STATUS_DEFAULT)
+        badge_markdown = (
+            f"[![{status_text}](https://img.shields.io/badge/Reproducibility-{status_text}-{color})]"
+            f"({base_url}/jobs/{job.id})"
+        )
 
         # Write badge
-        badge_file.write_text(badge_markdown, encoding="utf-8")
+        badge_size = badge_file.write_bytes(badge_markdown.encode("utf-8"))
 
-        logger.info(f"Generated badge at {badge_file}")
-        return badge_file
+        logger.info("Generated badge at %s", badge_file)
+        return badge_file, badge_size
@@ -1,10 +1,32 @@
 """Badge generator for reviews."""
 
+import functools
 import logging
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# SVG template (shields.io style), filled with the badge text and color
+_SVG_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="150" height="20" role="img" aria-label="{text}">
+  <title>{text}</title>
+  <linearGradient id="s" x2="0" y2="100%">
+    <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
+    <stop offset="1" stop-opacity=".1"/>
+  </linearGradient>
+  <clipPath id="r">
+    <rect width="150" height="20" rx="3" fill="#fff"/>
+  </clipPath>
+  <g clip-path="url(#r)">
+    <rect width="150" height="20" fill="#555"/>
+    <rect x="0" width="150" height="20" fill="{color}"/>
+    <rect width="150" height="20" fill="url(#s)"/>
+  </g>
+  <g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" text-rendering="geometricPrecision" font-size="11">
+    <text x="75" y="14" fill="#010101" fill-opacity=".3">{text}</text>
+    <text x="75" y="13">{text}</text>
+  </g>
+</svg>'''
+
 
 def generate_badge_svg(
     badge_type: str,
@@ -24,26 +46,44 @@ def generate_badge_svg(
     Returns:
         SVG content as string
     """
+    return _render_badge(badge_type, _badge_status_key(badge_type, status))
+
+
+def _badge_status_key(badge_type: str, status: str | bool) -> str:
+    """Normalize a badge status to the small key set used by the render cache."""
+    if badge_type == "method-check":
+        return status if status in ("ok", "partial") else "fail"
+    return "true" if isinstance(status, bool) and status else "false"
+
+
+@functools.lru_cache(maxsize=16)
+def _render_badge(badge_type: str, status_key: str) -> str:
+    """
+    Render the SVG for a (badge_type, status_key) pair.
+
+    The SVG does not depend on the review, so the handful of possible badges
+    are rendered once and cached.
+    """
     # Determine badge color and text
     if badge_type == "claim-mapped":
-        if isinstance(status, bool) and status:
+        if status_key == "true":
             color = "#10B981"  # Green
             text = "Claim-mapped"
         else:
             color = "#9CA3AF"  # Gray
             text = "Not mapped"
     elif badge_type == "method-check":
-        if status == "ok":
+        if status_key == "ok":
             color = "#10B981"  # Green
             text = "Method-check: OK"
-        elif status == "partial":
+        elif status_key == "partial":
             color = "#F59E0B"  # Amber
             text = "Method-check: Partial"
         else:
             color = "#EF4444"  # Red
             text = "Method-check: Fail"
     elif badge_type == "citations-augmented":
-        if isinstance(status, bool) and status:
+        if status_key == "true":
             color = "#10B981"  # Green
             text = "Citations-augmented"
         else:
@@ -53,28 +93,7 @@ def generate_badge_svg(
         color = "#9CA3AF"
         text = "Unknown"
 
-    # SVG template (shields.io style)
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="150" height="20" role="img" aria-label="{text}">
-  <title>{text}</title>
-  <linearGradient id="s" x2="0" y2="100%">
-    <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
-    <stop offset="1" stop-opacity=".1"/>
-  </linearGradient>
-  <clipPath id="r">
-    <rect width="150" height="20" rx="3" fill="#fff"/>
-  </clipPath>
-  <g clip-path="url(#r)">
-    <rect width="150" height="20" fill="#555"/>
-    <rect x="0" width="150" height="20" fill="{color}"/>
-    <rect width="150" height="20" fill="url(#s)"/>
-  </g>
-  <g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" text-rendering="geometricPrecision" font-size="11">
-    <text x="75" y="14" fill="#010101" fill-opacity=".3">{text}</text>
-    <text x="75" y="13">{text}</text>
-  </g>
-</svg>'''
-
-    return svg
+    return _SVG_TEMPLATE.format_map({"text": text, "color": color})
 
 
 def compute_badge_status(
@@ -98,19 +117,7 @@ def compute_badge_status(
     elif badge_type == "method-check":
         checklist = review_data.get("checklist", {})
         items = checklist.get("items", [])
-        if not items:
-            return "fail"
-
-        ok_count = sum(1 for item in items if item.get("status") == "ok")
-        partial_count = sum(1 for item in items if item.get("status") == "partial")
-        total = len(items)
-
-        if ok_count == total:
-            return "ok"
-        elif ok_count + partial_count >= total * 0.7:  # 70% OK or partial
-            return "partial"
-        else:
-            return "fail"
+        return _method_check_status(items)
 
     elif badge_type == "citations-augmented":
         citations = review_data.get("citations", {})
@@ -120,9 +127,8 @@ def compute_badge_status(
             return False
 
         # Count claims with at least one citation
-        claims_with_cites = sum(
-            1 for claim in claims if citations.get(claim.get("id", ""), [])
-        )
+        covered = {claim_id for claim_id, cites in citations.items() if cites}
+        claims_with_cites = sum(1 for claim in claims if claim.get("id", "") in covered)
         coverage = claims_with_cites / len(claims) if claims else 0.0
 
         return coverage >= 0.7  # 70% coverage
@@ -130,6 +136,39 @@ def compute_badge_status(
     return False
 
 
+def _method_check_status(items: list[dict[str, Any]]) -> str:
+    """
+    Compute the method-check status from checklist items.
+
+    Plain Python over at most a handful of items per review; each call is a
+    single pass that returns early once the outcome is decided.
+    """
+    if not items:
+        return "fail"
+
+    # Count OK/partial items in one pass
+    ok_count = 0
+    partial_count = 0
+    total = len(items)
+    threshold = total * 0.7  # 70% OK or partial
+    for seen, item in enumerate(items, 1):
+        status = item.get("status")
+        if status == "ok":
+            ok_count += 1
+        elif status == "partial":
+            partial_count += 1
+        # Fail as soon as the remaining items can no longer reach the threshold
+        if ok_count + partial_count + (total - seen) < threshold:
+            return "fail"
+
+    if ok_count == total:
+        return "ok"
+    elif ok_count + partial_count >= threshold:
+        return "partial"
+    else:
+        return "fail"
+
+
 def generate_badges(review_data: dict[str, Any], base_url: str = "http://localhost:8000") -> dict[str, str]:
     """
     Generate all badges for a review.
@@ -1,6 +1,8 @@
 """Method checklist generator for reproducibility assessment."""
 
+import itertools
 import logging
+import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,8 +12,75 @@ from app.worker.claim_extractor import Claim
 
 logger = logging.getLogger(__name__)
 
+# Paper-text patterns per checklist slot, in priority order (the first pattern
+# of a slot that matches anywhere in the paper decides it)
+_PAPER_PATTERNS: dict[str, list[str]] = {
+    "data": [
+        r"dataset[:\s]+(?:https?://|www\.)",
+        r"data[:\s]+(?:available|provided|download)",
+        r"https?://[^\s]+(?:data|dataset)",
+    ],
+    "seed": [
+        r"seed[:\s=]+(?:\d+)",
+        r"random[_\s]?state[:\s=]+(?:\d+)",
+        r"random[_\s]?seed[:\s=]+(?:\d+)",
+    ],
+    "command": [
+        r"(?:run|execute|command)[:\s]+(?:python|bash|sh)",
+        r"python\s+[a-z_]+\.py",
+    ],
+    "metric": [
+        r"(?:accuracy|precision|recall|f1|f-score|auroc|auc|roc)",
+        r"metric[s]?[:\s]+(?:accuracy|f1)",
+    ],
+    "baseline": [
+        r"baseline[s]?",
+        r"compared\s+to",
+        r"versus|vs\.",
+        r"state-of-the-art|SOTA",
+    ],
+    "named_baseline": [
+        r"(?:BERT|GPT|ResNet|VGG)\s+(?:baseline|comparison)",
+    ],
+}
+
+# Group names per slot, in priority order
+_PAPER_GROUPS: dict[str, list[str]] = {
+    slot: [f"{slot}_{i}" for i in range(len(patterns))]
+    for slot, patterns in _PAPER_PATTERNS.items()
+}
+_PAPER_GROUP_COUNT = sum(len(groups) for groups in _PAPER_GROUPS.values())
+
+# All paper patterns fused into a single pass. Each alternative is wrapped in a
+# lookahead so matches may overlap (e.g. a URL inside a "dataset: ..." match).
+# No two patterns can match at the same start position (their literal prefixes
+# are mutually exclusive), so the first position reported for a group is that
+# pattern's leftmost match. The leading character class holds the possible
+# first letters and lets the engine skip other positions cheaply; keep it in
+# sync when adding patterns.
+_PAPER_SCAN = re.compile(
+    "(?=[abcdefghmprsv])(?="
+    + "|".join(
+        f"(?P<{group}>{pattern})"
+        for slot, patterns in _PAPER_PATTERNS.items()
+        for group, pattern in zip(_PAPER_GROUPS[slot], patterns, strict=True)
+    )
+    + ")",
+    re.IGNORECASE,
+)
+
+# Repository patterns (README / source files)
+_README_DATA_PATTERN = re.compile(rb"data|dataset", re.IGNORECASE)
+_README_COMMAND_PATTERN = re.compile(rb"python|run|execute|usage", re.IGNORECASE)
+_README_LICENSE_PATTERN = re.compile(rb"license|licence", re.IGNORECASE)
+_CODE_SEED_PATTERN = re.compile(rb"seed\s*=\s*\d+|random_state\s*=\s*\d+")
+
+# Bounds for the source-code seed scan (files inspected, max size of a file)
+_MAX_SEED_SCAN_FILES = 10
+_MAX_SEED_SCAN_BYTES = 256 * 1024
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChecklistItem:
     """Represents a checklist item."""
 
@@ -21,7 +90,15 @@ class ChecklistItem:
     source: str  # "paper" or "repo"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class RepoFacts:
+    """Repository facts shared by the repo checks of one checklist."""
+
+    root_entries: dict[str, bool] | None  # Root entry name -> is directory
+    readme: bytes | None  # Raw README.md contents
+
+
+@dataclass(slots=True, frozen=True)
 class Checklist:
     """Complete checklist for a review."""
 
@@ -29,97 +106,168 @@ class Checklist:
     summary: str  # Overall summary
 
 
-def check_data_available(paper_text: str, repo_path: Path | None = None) -> ChecklistItem:
+def scan_paper(paper_text: str) -> dict[str, str]:
+    """
+    Scan the paper once for every checklist pattern.
+
+    Args:
+        paper_text: Paper text
+
+    Returns:
+        Mapping of pattern group name to the text of its first match
+    """
+    matches: dict[str, str] = {}
+    for match in _PAPER_SCAN.finditer(paper_text):
+        group = match.lastgroup
+        if group not in matches:
+            matches[group] = match.group(group)
+            if len(matches) == _PAPER_GROUP_COUNT:
+                break
+    return matches
+
+
+def _first_paper_match(paper_matches: dict[str, str], slot: str) -> str | None:
+    """Return the match of the highest-priority pattern of a slot, if any matched."""
+    for group in _PAPER_GROUPS[slot]:
+        if group in paper_matches:
+            return paper_matches[group]
+    return None
+
+
+def scan_repo(repo_path: Path | None) -> RepoFacts:
+    """
+    Gather the repository facts used by the checks with one root listing and one README read.
+
+    Args:
+        repo_path: Repository path
+
+    Returns:
+        RepoFacts (root_entries is None if there is no readable repository directory)
+    """
+    if repo_path is None:
+        return RepoFacts(root_entries=None, readme=None)
+    try:
+        with os.scandir(repo_path) as entries:
+            root_entries = {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return RepoFacts(root_entries=None, readme=None)
+
+    readme = None
+    if "README.md" in root_entries:
+        readme = (repo_path / "README.md").read_bytes()
+
+    return RepoFacts(root_entries=root_entries, readme=readme)
+
+
+def check_data_available(
+    paper_text: str,
+    repo_path: Path | None = None,
+    paper_matches: dict[str, str] | None = None,
+    repo_facts: RepoFacts | None = None,
+) -> ChecklistItem:
     """
     Check if data is clearly available (link or instructions).
 
     Args:
         paper_text: Paper text
         repo_path: Optional repository path
+        paper_matches: Result of scan_paper(paper_text), computed if not given
+        repo_facts: Result of scan_repo(repo_path), computed if not given
 
     Returns:
         ChecklistItem
     """
     evidence = None
     status = "missing"
+    source = "repo"
+
+    if paper_matches is None:
+        paper_matches = scan_paper(paper_text)
 
     # Check paper text for data links/mentions
-    data_patterns = [
-        r"dataset[:\s]+(?:https?://|www\.)",
-        r"data[:\s]+(?:available|provided|download)",
-        r"https?://[^\s]+(?:data|dataset)",
-    ]
+    match = _first_paper_match(paper_matches, "data")
+    if match is not None:
+        evidence = match
+        status = "ok"
+        source = "paper"
 
-    for pattern in data_patterns:
-        match = re.search(pattern, paper_text, re.IGNORECASE)
-        if match:
-            evidence = match.group(0)
-            status = "ok"
-            break
+    if repo_facts is None:
+        repo_facts = scan_repo(repo_path)
+    root_entries = repo_facts.root_entries
 
     # Check repo for data directory or README mention
-    if repo_path and repo_path.exists():
+    if root_entries is not None:
         data_dirs = ["data", "datasets", "data_files"]
         for data_dir in data_dirs:
-            if (repo_path / data_dir).exists():
+            if data_dir in root_entries:
                 status = "ok" if status == "missing" else "partial"
                 evidence = f"Found {data_dir}/ directory in repo"
+                source = "repo"
                 break
 
         # Check README for data instructions
-        readme_path = repo_path / "README.md"
-        if readme_path.exists():
-            readme_text = readme_path.read_text()
-            if re.search(r"data|dataset", readme_text, re.IGNORECASE):
+        if repo_facts.readme is not None:
+            if _README_DATA_PATTERN.search(repo_facts.readme):
                 if status == "missing":
                     status = "partial"
                     evidence = "README mentions data"
+                    source = "repo"
 
     return ChecklistItem(
         key="data_available",
         status=status,
         evidence=evidence,
-        source="paper" if evidence and "paper" in str(evidence) else "repo",
+        source=source,
     )
 
 
-def check_seeds_fixed(paper_text: str, repo_path: Path | None = None) -> ChecklistItem:
+def check_seeds_fixed(
+    paper_text: str,
+    repo_path: Path | None = None,
+    paper_matches: dict[str, str] | None = None,
+    repo_facts: RepoFacts | None = None,
+) -> ChecklistItem:
     """
     Check if seeds are fixed (mentions of seed, random_state).
 
     Args:
         paper_text: Paper text
         repo_path: Optional repository path
+        paper_matches: Result of scan_paper(paper_text), computed if not given
+        repo_facts: Result of scan_repo(repo_path), computed if not given
 
     Returns:
         ChecklistItem
     """
     evidence = None
     status = "missing"
+    source = "repo"
+
+    if paper_matches is None:
+        paper_matches = scan_paper(paper_text)
 
     # Check paper for seed mentions
-    seed_patterns = [
-        r"seed[:\s=]+(\d+)",
-        r"random[_\s]?state[:\s=]+(\d+)",
-        r"random[_\s]?seed[:\s=]+(\d+)",
-    ]
+    match = _first_paper_match(paper_matches, "seed")
+    if match is not None:
+        evidence = match
+        status = "ok"
+        source = "paper"
+
+    if repo_facts is None:
+        repo_facts = scan_repo(repo_path)
+    root_entries = repo_facts.root_entries
 
-    for pattern in seed_patterns:
-        match = re.search(pattern, paper_text, re.IGNORECASE)
-        if match:
-            evidence = match.group(0)
-            status = "ok"
-            break
-
-    # Check repo code for seed settings
-    if repo_path and repo_path.exists():
-        python_files = list(repo_path.rglob("*.py"))
-        for py_file in python_files[:10]:  # Check first 10 Python files
+    # Check repo code for seed settings (an empty root has no Python files to walk)
+    if root_entries:
+        # Check first 10 Python files (lazily, without listing the whole repo)
+        for py_file in itertools.islice(repo_path.rglob("*.py"), _MAX_SEED_SCAN_FILES):
             try:
-                content = py_file.read_text()
-                if re.search(r"seed\s*=\s*\d+|random_state\s*=\s*\d+", content):
+                if py_file.stat().st_size > _MAX_SEED_SCAN_BYTES:
+                    continue
+                if _CODE_SEED_PATTERN.search(py_file.read_bytes()):
                     status = "ok" if status == "missing" else "partial"
                     evidence = f"Found seed setting in {py_file.name}"
+                    source = "repo"
                     break
             except Exception:
                 continue
@@ -128,21 +276,28 @@ def check_seeds_fixed(paper_text: str, repo_path: Path | None = None) -> Checkli
         key="seeds_fixed",
         status=status,
         evidence=evidence,
-        source="paper" if evidence and "paper" in str(evidence) else "repo",
+        source=source,
     )
 
 
-def check_environment_files(repo_path: Path | None = None) -> ChecklistItem:
+def check_environment_files(
+    repo_path: Path | None = None, repo_facts: RepoFacts | None = None
+) -> ChecklistItem:
     """
     Check for environment files (requirements.txt, environment.yml, etc.).
 
     Args:
         repo_path: Repository path
+        repo_facts: Result of scan_repo(repo_path), computed if not given
 
     Returns:
         ChecklistItem
     """
-    if not repo_path or not repo_path.exists():
+    if repo_facts is None:
+        repo_facts = scan_repo(repo_path)
+    root_entries = repo_facts.root_entries
+
+    if root_entries is None:
         return ChecklistItem(
             key="environment",
             status="missing",
@@ -158,10 +313,7 @@ def check_environment_files(repo_path: Path | None = None) -> ChecklistItem:
         "setup.py",
     ]
 
-    found_files = []
-    for env_file in env_files:
-        if (repo_path / env_file).exists():
-            found_files.append(env_file)
+    found_files = [env_file for env_file in env_files if env_file in root_entries]
 
     if found_files:
         return ChecklistItem(
@@ -179,73 +331,78 @@ def check_environment_files(repo_path: Path | None = None) -> ChecklistItem:
         )
 
 
-def check_commands_available(paper_text: str, repo_path: Path | None = None) -> ChecklistItem:
+def check_commands_available(
+    paper_text: str,
+    repo_path: Path | None = None,
+    paper_matches: dict[str, str] | None = None,
+    repo_facts: RepoFacts | None = None,
+) -> ChecklistItem:
     """
     Check if execution commands are available (README or paper).
 
     Args:
         paper_text: Paper text
         repo_path: Optional repository path
+        paper_matches: Result of scan_paper(paper_text), computed if not given
+        repo_facts: Result of scan_repo(repo_path), computed if not given
 
     Returns:
         ChecklistItem
     """
     evidence = None
     status = "missing"
+    source = "repo"
+
+    if paper_matches is None:
+        paper_matches = scan_paper(paper_text)
 
     # Check paper for command mentions
-    command_patterns = [
-        r"(?:run|execute|command)[:\s]+(?:python|bash|sh)",
-        r"python\s+[a-z_]+\.py",
-    ]
+    if _first_paper_match(paper_matches, "command") is not None:
+        status = "partial"
+        evidence = "Paper mentions execution commands"
+        source = "paper"
 
-    for pattern in command_patterns:
-        if re.search(pattern, paper_text, re.IGNORECASE):
-            status = "partial"
-            evidence = "Paper mentions execution commands"
-            break
+    if repo_facts is None:
+        repo_facts = scan_repo(repo_path)
 
     # Check README for commands
-    if repo_path and repo_path.exists():
-        readme_path = repo_path / "README.md"
-        if readme_path.exists():
-            readme_text = readme_path.read_text()
-            if re.search(r"python|run|execute|usage", readme_text, re.IGNORECASE):
-                status = "ok" if status == "missing" else "partial"
-                evidence = "README contains execution instructions"
+    if repo_facts.readme is not None:
+        if _README_COMMAND_PATTERN.search(repo_facts.readme):
+            status = "ok" if status == "missing" else "partial"
+            evidence = "README contains execution instructions"
+            source = "repo"
 
     return ChecklistItem(
         key="commands",
         status=status,
         evidence=evidence,
-        source="paper" if "Paper" in str(evidence) else "repo",
+        source=source,
     )
 
 
-def check_metrics_defined(paper_text: str) -> ChecklistItem:
+def check_metrics_defined(
+    paper_text: str, paper_matches: dict[str, str] | None = None
+) -> ChecklistItem:
     """
     Check if metrics are defined (accuracy, F1, AUROC, etc.).
 
     Args:
         paper_text: Paper text
+        paper_matches: Result of scan_paper(paper_text), computed if not given
 
     Returns:
         ChecklistItem
     """
-    metric_patterns = [
-        r"(?:accuracy|precision|recall|f1|f-score|auroc|auc|roc)",
-        r"metric[s]?[:\s]+(?:accuracy|f1)",
-    ]
-
     evidence = None
     status = "missing"
 
-    for pattern in metric_patterns:
-        match = re.search(pattern, paper_text, re.IGNORECASE)
-        if match:
-            evidence = match.group(0)
-            status = "ok"
-            break
+    if paper_matches is None:
+        paper_matches = scan_paper(paper_text)
+
+    match = _first_paper_match(paper_matches, "metric")
+    if match is not None:
+        evidence = match
+        status = "ok"
 
     return ChecklistItem(
         key="metrics",
@@ -255,34 +412,31 @@ def check_metrics_defined(paper_text: str) -> ChecklistItem:
     )
 
 
-def check_comparatives(paper_text: str) -> ChecklistItem:
+def check_comparatives(
+    paper_text: str, paper_matches: dict[str, str] | None = None
+) -> ChecklistItem:
     """
     Check if baselines are named and compared.
 
     Args:
         paper_text: Paper text
+        paper_matches: Result of scan_paper(paper_text), computed if not given
 
     Returns:
         ChecklistItem
     """
-    baseline_patterns = [
-        r"baseline[s]?",
-        r"compared\s+to",
-        r"versus|vs\.",
-        r"state-of-the-art|SOTA",
-    ]
-
     evidence = None
     status = "missing"
 
-    for pattern in baseline_patterns:
-        if re.search(pattern, paper_text, re.IGNORECASE):
-            status = "partial"
-            evidence = "Paper mentions baselines/comparisons"
-            break
+    if paper_matches is None:
+        paper_matches = scan_paper(paper_text)
+
+    if _first_paper_match(paper_matches, "baseline") is not None:
+        status = "partial"
+        evidence = "Paper mentions baselines/comparisons"
 
     # Check for specific baseline names
-    if re.search(r"(?:BERT|GPT|ResNet|VGG)\s+(?:baseline|comparison)", paper_text, re.IGNORECASE):
+    if _first_paper_match(paper_matches, "named_baseline") is not None:
         status = "ok"
         evidence = "Paper names specific baselines"
 
@@ -294,17 +448,25 @@ def check_comparatives(paper_text: str) -> ChecklistItem:
     )
 
 
-def check_license(repo_path: Path | None = None) -> ChecklistItem:
+def check_license(
+    repo_path: Path | None = None,
+    repo_facts: RepoFacts | None = None,
+) -> ChecklistItem:
     """
     Check if code/data has explicit license.
 
     Args:
         repo_path: Repository path
+        repo_facts: Result of scan_repo(repo_path), computed if not given
 
     Returns:
         ChecklistItem
     """
-    if not repo_path or not repo_path.exists():
+    if repo_facts is None:
+        repo_facts = scan_repo(repo_path)
+    root_entries = repo_facts.root_entries
+
+    if root_entries is None:
         return ChecklistItem(
             key="license",
             status="missing",
@@ -314,7 +476,7 @@ def check_license(repo_path: Path | None = None) -> ChecklistItem:
 
     license_files = ["LICENSE", "LICENSE.txt", "LICENSE.md", "COPYING"]
     for license_file in license_files:
-        if (repo_path / license_file).exists():
+        if license_file in root_entries:
             return ChecklistItem(
                 key="license",
                 status="ok",
@@ -323,10 +485,8 @@ def check_license(repo_path: Path | None = None) -> ChecklistItem:
             )
 
     # Check README for license mention
-    readme_path = repo_path / "README.md"
-    if readme_path.exists():
-        readme_text = readme_path.read_text()
-        if re.search(r"license|licence", readme_text, re.IGNORECASE):
+    if repo_facts.readme is not None:
+        if _README_LICENSE_PATTERN.search(repo_facts.readme):
             return ChecklistItem(
                 key="license",
                 status="partial",
@@ -360,14 +520,18 @@ def generate_checklist(
     """
     items: list[ChecklistItem] = []
 
+    # Scan the paper and the repository once for all checks
+    paper_matches = scan_paper(paper_text)
+    repo_facts = scan_repo(repo_path)
+
     # Check each item
-    items.append(check_data_available(paper_text, repo_path))
-    items.append(check_seeds_fixed(paper_text, repo_path))
-    items.append(check_environment_files(repo_path))
-    items.append(check_commands_available(paper_text, repo_path))
-    items.append(check_metrics_defined(paper_text))
-    items.append(check_comparatives(paper_text))
-    items.append(check_license(repo_path))
+    items.append(check_data_available(paper_text, repo_path, paper_matches, repo_facts))
+    items.append(check_seeds_fixed(paper_text, repo_path, paper_matches, repo_facts))
+    items.append(check_environment_files(repo_path, repo_facts))
+    items.append(check_commands_available(paper_text, repo_path, paper_matches, repo_facts))
+    items.append(check_metrics_defined(paper_text, paper_matches))
+    items.append(check_comparatives(paper_text, paper_matches))
+    items.append(check_license(repo_path, repo_facts))
 
     # Generate summary
     ok_count = sum(1 for item in items if item.status == "ok")
@@ -401,4 +565,3 @@ def checklist_to_json(checklist: Checklist) -> dict[str, Any]:
         ],
         "summary": checklist.summary,
     }
-
@@ -6,11 +6,12 @@ from typing import Any
 
 from app.config import settings
 from app.worker.claim_extractor import Claim
+from app.worker.rag.embeddings import embed_batch
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CitationCandidate:
     """Citation candidate with scores."""
 
@@ -56,11 +57,73 @@ def suggest_citations(
         logger.warning("RAG disabled, returning empty citations")
         return []
 
-    # Step 1: Expand query (simple: use claim text + section context)
+    return _suggest_citations_batch([claim], paper_context, top_k, min_score)[claim.id]
+
+
+def suggest_citations_for_claims(
+    claims: list[Claim],
+    paper_text: str,
+    paper_meta: dict[str, Any] | None = None,
+) -> dict[str, list[CitationCandidate]]:
+    """
+    Suggest citations for multiple claims.
+
+    All claim queries are embedded in a single batch, then ranked per claim.
+
+    Args:
+        claims: List of Claim objects
+        paper_text: Full paper text (for building local index)
+        paper_meta: Optional paper metadata
+
+    Returns:
+        Dictionary mapping claim_id to list of CitationCandidate
+    """
+    if not settings.rag_enabled:
+        logger.warning("RAG disabled, returning empty citations")
+        return {claim.id: [] for claim in claims}
+
+    return _suggest_citations_batch(claims, paper_meta)
+
+
+def _suggest_citations_batch(
+    claims: list[Claim],
+    paper_context: dict[str, Any] | None = None,
+    top_k: int = 5,
+    min_score: float = 0.3,
+) -> dict[str, list[CitationCandidate]]:
+    """Run the RAG pipeline for a batch of claims, embedding all queries at once."""
+    corpus = _load_corpus(paper_context)
+    if not corpus:
+        # Nothing to search yet: skip embedding (and loading the model) entirely
+        logger.info("Citation suggestion for %d claims (RAG pipeline placeholder)", len(claims))
+        return {claim.id: [] for claim in claims}
+
+    # Step 1: Expand queries (simple: use claim text + section context)
+    queries = [_build_query(claim) for claim in claims]
+
+    # One batched forward pass instead of one model call per claim
+    query_embeddings = embed_batch(queries)
+
+    return {
+        claim.id: _rank_citations(query, query_embedding, corpus, top_k, min_score)
+        for claim, query, query_embedding in zip(claims, queries, query_embeddings, strict=True)
+    }
+
+
+def _build_query(claim: Claim) -> str:
+    """Build the search query for a claim (claim text + section context)."""
     query = claim.text
     if claim.section:
         query = f"{claim.section} {query}"
+    return query
+
 
+def _load_corpus(paper_context: dict[str, Any] | None) -> list[dict[str, Any]]:
+    """
+    Get the citation corpus to search.
+
+    Placeholder: returns an empty corpus for now (will be implemented with actual corpus).
+    """
     # Step 2: Hybrid search (BM25 + dense)
     # For now, use a simple corpus (paper's own text or external API)
     # TODO: Integrate with CrossRef/arXiv APIs for external corpus
@@ -69,10 +132,17 @@ def suggest_citations(
     # - Build index from paper's related work section
     # - Query external APIs (CrossRef, arXiv) if enabled
     # - Use hybrid search to get top-50
+    return []
 
-    # Placeholder: return empty for now (will be implemented with actual corpus)
-    logger.info(f"Citation suggestion for claim {claim.id} (RAG pipeline placeholder)")
 
+def _rank_citations(
+    query: str,
+    query_embedding: list[float],
+    corpus: list[dict[str, Any]],
+    top_k: int,
+    min_score: float,
+) -> list[CitationCandidate]:
+    """Rank corpus entries for one query embedding (placeholder)."""
     # TODO: Implement full pipeline:
     # 1. Get corpus (paper text + external if available)
     # 2. Build/update BM25 index
@@ -81,31 +151,4 @@ def suggest_citations(
     # 5. Re-rank
     # 6. Dedup
     # 7. Return top-k
-
     return []
-
-
-def suggest_citations_for_claims(
-    claims: list[Claim],
-    paper_text: str,
-    paper_meta: dict[str, Any] | None = None,
-) -> dict[str, list[CitationCandidate]]:
-    """
-    Suggest citations for multiple claims.
-
-    Args:
-        claims: List of Claim objects
-        paper_text: Full paper text (for building local index)
-        paper_meta: Optional paper metadata
-
-    Returns:
-        Dictionary mapping claim_id to list of CitationCandidate
-    """
-    citations_by_claim: dict[str, list[CitationCandidate]] = {}
-
-    for claim in claims:
-        citations = suggest_citations(claim, paper_context=paper_meta)
-        citations_by_claim[claim.id] = citations
-
-    return citations_by_claim
-
@@ -1,16 +1,27 @@
 """Claim extraction from paper text."""
 
+import bisect
 import logging
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
-from app.worker.section_segmenter import segment_paper
+from app.worker.section_segmenter import has_sections, segment_paper
 
 logger = logging.getLogger(__name__)
 
+# Try to import hyperscan (optional multi-pattern DFA for claim scanning)
+try:
+    import hyperscan
 
-@dataclass
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    logger.debug("hyperscan not available, using re for claim scanning")
+
+
+@dataclass(slots=True, frozen=True)
 class Claim:
     """Represents a claim extracted from paper."""
 
@@ -31,47 +42,84 @@ CLAIM_PATTERNS = [
     (r"\b(?:we|our)\s+(?:contribution|contribution|novelty)\b", 0.6),
 ]
 
-
-def extract_claims_baseline(text: str, section_name: str | None = None) -> list[Claim]:
+# All claim patterns fused into one scan. Each alternative sits inside a
+# lookahead so matches may overlap, and alternatives are ordered by descending
+# confidence so the best pattern starting at each position wins.
+_CLAIM_PATTERNS_BY_CONFIDENCE = sorted(CLAIM_PATTERNS, key=lambda item: item[1], reverse=True)
+_CLAIM_SCAN = re.compile(
+    "(?="
+    + "|".join(
+        f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(_CLAIM_PATTERNS_BY_CONFIDENCE)
+    )
+    + ")",
+    re.IGNORECASE,
+)
+_CLAIM_CONFIDENCES = {f"p{i}": conf for i, (_, conf) in enumerate(_CLAIM_PATTERNS_BY_CONFIDENCE)}
+_MAX_CLAIM_CONFIDENCE = _CLAIM_PATTERNS_BY_CONFIDENCE[0][1]
+
+# Hyperscan database for CLAIM_PATTERNS (compiled on first use)
+_claim_database = None
+
+# Sections scanned for claims; the segmenter skips everything else
+_CLAIM_SECTIONS = frozenset({"results", "discussion", "conclusion", "introduction"})
+
+# A sentence starts at a non-whitespace character and ends at a period,
+# exclamation or question mark followed by whitespace (or at the last
+# non-whitespace character of the text), so matches are already stripped.
+# Written as an unrolled loop ([^.!?]* runs between punctuation not followed by
+# whitespace) so the engine scans runs instead of stepping char by char.
+_SENTENCE_PATTERN = re.compile(r"(?=\S)[^.!?]*(?:[.!?](?!\s)[^.!?]*)*[.!?]?(?<=\S)")
+
+
+def extract_claims_baseline(
+    text: str,
+    section_name: str | None = None,
+    seen: set[str] | None = None,
+) -> list[Claim]:
     """
     Extract claims using baseline deterministic patterns.
 
     Args:
         text: Paper text or section text
         section_name: Optional section name for context
+        seen: Optional set of dedup keys (lowercased first 100 chars) shared
+            across calls; claims whose key is already present are skipped
 
     Returns:
         List of Claim objects
     """
     claims: list[Claim] = []
-    sentences = _split_sentences(text)
+    match_ends, match_confidences = _scan_claim_matches(text)
 
     claim_id = 0
-    for sentence in sentences:
-        sentence_stripped = sentence.strip()
+    for sentence_stripped, start in _iter_sentences(text):
         if len(sentence_stripped) < 20:  # Skip very short sentences
             continue
 
         # Check for claim patterns
-        best_match = None
-        best_confidence = 0.0
-
-        for pattern, confidence in CLAIM_PATTERNS:
-            if re.search(pattern, sentence_stripped, re.IGNORECASE):
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_match = pattern
-
-        if best_match:
-            # Find position in original text
-            start = text.find(sentence_stripped)
-            end = start + len(sentence_stripped) if start >= 0 else 0
+        end = start + len(sentence_stripped)
+        if match_ends is None:
+            best_confidence = _claim_confidence(sentence_stripped)
+        else:
+            # Patterns never match sentence punctuation, so a match ending
+            # inside the sentence lies entirely within it
+            lo = bisect.bisect_right(match_ends, start)
+            hi = bisect.bisect_right(match_ends, end, lo)
+            best_confidence = max(match_confidences[lo:hi], default=0.0)
+
+        if best_confidence > 0.0:
+            if seen is not None:
+                text_key = sentence_stripped.lower()[:100]
+                if text_key in seen:
+                    claim_id += 1  # Ids are numbered before deduplication
+                    continue
+                seen.add(text_key)
 
             claim = Claim(
                 id=f"c{claim_id}",
                 text=sentence_stripped,
                 section=section_name,
-                spans=[[start, end]] if start >= 0 else [],
+                spans=[[start, start + len(sentence_stripped)]],
                 confidence=best_confidence,
             )
             claims.append(claim)
@@ -80,6 +128,52 @@ def extract_claims_baseline(text: str, section_name: str | None = None) -> list[
     return claims
 
 
+def _claim_confidence(sentence: str) -> float:
+    """Return the highest confidence among claim patterns matching the sentence (0 if none)."""
+    best_confidence = 0.0
+    for match in _CLAIM_SCAN.finditer(sentence):
+        confidence = _CLAIM_CONFIDENCES[match.lastgroup]
+        if confidence > best_confidence:
+            best_confidence = confidence
+            if best_confidence == _MAX_CLAIM_CONFIDENCE:
+                break
+    return best_confidence
+
+
+def _scan_claim_matches(text: str) -> tuple[list[int] | None, list[float]]:
+    """
+    Scan the whole text for claim patterns in one hyperscan pass.
+
+    Only used for ASCII text, where hyperscan byte offsets equal character
+    offsets and its ASCII word boundaries agree with ``re``.
+
+    Returns:
+        (sorted match end offsets, matching confidences), or (None, []) when
+        hyperscan is unavailable and sentences should be scanned with ``re``
+    """
+    if not HYPERSCAN_AVAILABLE or not text.isascii():
+        return None, []
+
+    global _claim_database
+    if _claim_database is None:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern, _ in CLAIM_PATTERNS],
+            ids=list(range(len(CLAIM_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(CLAIM_PATTERNS),
+        )
+        _claim_database = database
+
+    matches: list[tuple[int, float]] = []
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        matches.append((end, CLAIM_PATTERNS[pattern_id][1]))
+
+    _claim_database.scan(text.encode(), match_event_handler=on_match)
+    matches.sort()
+    return [end for end, _ in matches], [confidence for _, confidence in matches]
+
+
 def extract_claims_by_section(text: str) -> list[Claim]:
     """
     Extract claims from paper, segmented by section.
@@ -91,30 +185,20 @@ def extract_claims_by_section(text: str) -> list[Claim]:
         List of Claim objects with section information
     """
     all_claims: list[Claim] = []
+    seen_texts: set[str] = set()
 
-    # Get sections
-    sections = segment_paper(text)
-    if not sections:
+    # Get sections (focus on results, discussion, conclusion for claims)
+    sections = segment_paper(text, keep=_CLAIM_SECTIONS)
+    if not sections and not has_sections(text):
         # Fallback: extract from full text
         return extract_claims_baseline(text)
 
     # Extract claims from each section
     for section in sections:
-        # Focus on results, discussion, conclusion for claims
-        if section.name in ("results", "discussion", "conclusion", "introduction"):
-            section_claims = extract_claims_baseline(section.text, section.name)
-            all_claims.extend(section_claims)
-
-    # Remove duplicates (same text)
-    seen_texts = set()
-    unique_claims = []
-    for claim in all_claims:
-        text_key = claim.text.lower().strip()[:100]  # First 100 chars as key
-        if text_key not in seen_texts:
-            seen_texts.add(text_key)
-            unique_claims.append(claim)
+        # Duplicates (same first 100 chars) are dropped across sections
+        all_claims.extend(extract_claims_baseline(section.text, section.name, seen_texts))
 
-    return unique_claims
+    return all_claims
 
 
 def _split_sentences(text: str) -> list[str]:
@@ -129,24 +213,24 @@ def _split_sentences(text: str) -> list[str]:
     Returns:
         List of sentences
     """
-    # Simple sentence splitting by period, exclamation, question mark
-    # (handles common abbreviations)
-    sentence_endings = re.compile(r"([.!?])\s+")
-    sentences = sentence_endings.split(text)
-
-    result = []
-    for i in range(0, len(sentences) - 1, 2):
-        if i + 1 < len(sentences):
-            sentence = sentences[i] + sentences[i + 1]
-            result.append(sentence.strip())
-        else:
-            result.append(sentences[i].strip())
+    return [sentence for sentence, _ in _iter_sentences(text)]
 
-    # Add last sentence if exists
-    if len(sentences) % 2 == 1:
-        result.append(sentences[-1].strip())
 
-    return [s for s in result if s]
+def _iter_sentences(text: str) -> Iterator[tuple[str, int]]:
+    """
+    Iterate over sentences together with their start offset in ``text``.
+
+    Sentences end at a period, exclamation or question mark followed by
+    whitespace; surrounding whitespace is not included.
+
+    Args:
+        text: Text to split
+
+    Yields:
+        (sentence, start_offset) tuples
+    """
+    for match in _SENTENCE_PATTERN.finditer(text):
+        yield match.group(), match.start()
 
 
 def claims_to_json(claims: list[Claim]) -> list[dict[str, Any]]:
@@ -1,18 +1,135 @@
 """Docker image building utilities."""
 
+import fcntl
 import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import docker
-from docker.errors import BuildError, DockerException
+from docker.errors import BuildError, DockerException, ImageNotFound
+from docker.utils import parse_repository_tag
 
 from app.config import settings
 from app.utils.errors import DockerBuildError
 from app.utils.logging import log_step
-from app.worker.env_detector import EnvironmentInfo
+from app.worker.env_detector import DEFAULT_BASE_IMAGE, Dependency, EnvironmentInfo
 
 logger = logging.getLogger(__name__)
 
+# Pip requirements written next to the generated Dockerfile (pip and conda envs), so
+# the install layer only depends on the dependency list, not on the Dockerfile text
+REQUIREMENTS_FILENAME = "requirements.arandu.txt"
+
+# Written as .dockerignore when the repository has none, to keep VCS metadata,
+# virtualenvs and caches out of the build context. The repository is mounted
+# over /workspace at run time, so the image copy only has to serve the build.
+_DOCKERIGNORE_CONTENT = """\
+.git
+.venv
+venv
+__pycache__
+*.pyc
+.mypy_cache
+.pytest_cache
+.ruff_cache
+node_modules
+*.log
+"""
+
+# Fixed Dockerfile sections around the environment-specific install steps
+_DOCKERFILE_PREAMBLE = (
+    "FROM {base_image}\n"
+    "\n"
+    "# Create non-root user\n"
+    "RUN useradd -m -u {uid} {user}\n"
+    "\n"
+    "# Set working directory\n"
+    "WORKDIR /workspace\n"
+    "\n"
+)
+_DOCKERFILE_EPILOGUE = (
+    "# Copy repository files\n"
+    "COPY . .\n"
+    "\n"
+    "# Change ownership to non-root user\n"
+    "RUN chown -R {user}:{user} /workspace\n"
+    "\n"
+    "# Switch to non-root user\n"
+    "USER {user}\n"
+    "\n"
+    "# Default command\n"
+    'CMD ["python", "--version"]'
+)
+
+
+# Docker client shared by every call in this process (created on first use)
+_client: docker.DockerClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> docker.DockerClient:
+    """Return the process-wide Docker client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = docker.from_env()
+    return _client
+
+
+def _reset_client() -> None:
+    """Forget the parent's client in a forked child (its pooled sockets are not fork-safe)."""
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_client)
+
+
+# Seconds between attempts to take a build slot while all of them are held
+_BUILD_SLOT_POLL_SECONDS = 1.0
+
+
+@contextmanager
+def _build_slot() -> Iterator[None]:
+    """
+    Hold one of settings.docker_max_parallel_builds image build slots.
+
+    Worker processes on a host share one Docker daemon, and concurrent builds
+    contend for its layer store and disk, so the slots are flock()ed files that
+    every process sees rather than an in-process semaphore. Locks are released
+    by the kernel if the holding process dies.
+    """
+    slots_dir = settings.temp_repos_path.parent / "build-slots"
+    slots_dir.mkdir(parents=True, exist_ok=True)
+    slot_count = max(1, settings.docker_max_parallel_builds)
+    waiting = False
+    while True:
+        for index in range(slot_count):
+            slot_file = open(slots_dir / f"slot-{index}.lock", "a")
+            try:
+                fcntl.flock(slot_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError as e:
+                slot_file.close()
+                if isinstance(e, BlockingIOError):
+                    continue
+                raise
+            try:
+                yield
+            finally:
+                fcntl.flock(slot_file, fcntl.LOCK_UN)
+                slot_file.close()
+            return
+        if not waiting:
+            logger.info(f"All {slot_count} Docker build slots busy, waiting")
+            waiting = True
+        time.sleep(_BUILD_SLOT_POLL_SECONDS)
+
 
 def build_image(
     repo_path: Path,
@@ -42,8 +159,17 @@ def build_image(
         image_tag = f"arandu-job-{job_id}:latest"
 
         try:
-            # Initialize Docker client
-            client = docker.from_env()
+            client = _get_client()
+
+            # Write dependency manifest for the install layer
+            requirements = _format_requirements(env_info)
+            if requirements:
+                (repo_path / REQUIREMENTS_FILENAME).write_text("\n".join(requirements) + "\n")
+
+            # Shrink the build context unless the repository defines its own ignores
+            dockerignore_path = repo_path / ".dockerignore"
+            if not dockerignore_path.exists():
+                dockerignore_path.write_text(_DOCKERIGNORE_CONTENT)
 
             # Generate Dockerfile
             dockerfile_content = _generate_dockerfile(env_info, repo_path)
@@ -53,20 +179,31 @@ def build_image(
             dockerfile_path.write_text(dockerfile_content)
             logger.info(f"Generated Dockerfile at {dockerfile_path}")
 
-            # Build image
+            # Build image, reusing layers of the previous build's cache image
             logger.info(f"Building Docker image: {image_tag}")
-            image, build_logs = client.images.build(
-                path=str(repo_path),
-                dockerfile="Dockerfile.arandu",  # Relative path from build context
-                tag=image_tag,
-                rm=True,  # Remove intermediate containers
-                forcerm=True,  # Always remove intermediate containers
-            )
-
-            # Log build output
-            for log_line in build_logs:
-                if "stream" in log_line:
-                    logger.debug(f"Docker build: {log_line['stream'].strip()}")
+            cache_image = settings.docker_build_cache_image
+            with _build_slot():
+                build_logs = client.api.build(
+                    path=str(repo_path),
+                    dockerfile="Dockerfile.arandu",  # Relative path from build context
+                    tag=image_tag,
+                    rm=True,  # Remove intermediate containers
+                    forcerm=True,  # Always remove intermediate containers
+                    cache_from=[cache_image],
+                    decode=True,
+                )
+
+                # Log build output (the low-level API reports failures as events)
+                build_log_lines = []
+                for log_line in build_logs:
+                    build_log_lines.append(log_line)
+                    if "error" in log_line:
+                        raise BuildError(log_line["error"].strip(), iter(build_log_lines))
+                    if "stream" in log_line:
+                        logger.debug(f"Docker build: {log_line['stream'].strip()}")
+
+            # Keep this build's layers alive after the job image is removed
+            _move_cache_tag(client, image_tag, cache_image)
 
             logger.info(f"Successfully built image: {image_tag}")
             return image_tag
@@ -89,50 +226,29 @@ def _generate_dockerfile(env_info: EnvironmentInfo, repo_path: Path | None = Non
     """
     Generate Dockerfile content based on environment info.
 
+    Layers are ordered base + user, dependency manifest + install, then source, so
+    source-only changes reuse the cached dependency layer. For pip and conda envs
+    the install reads REQUIREMENTS_FILENAME, which build_image writes from
+    _format_requirements().
+
     Args:
         env_info: Environment information
+        repo_path: Optional repository path (used to detect lock files)
 
     Returns:
         Dockerfile content as string
     """
-    lines = [
-        f"FROM {env_info.base_image}",
-        "",
-        "# Create non-root user",
-        f"RUN useradd -m -u {settings.docker_user_uid} {settings.docker_user}",
-        "",
-        "# Set working directory",
-        "WORKDIR /workspace",
-        "",
-    ]
+    user = settings.docker_user
+    lines: list[str] = []
 
     # Install dependencies based on environment type
-    if env_info.type == "pip":
-        # Generate pip install command
-        deps = [dep.format_for_pip() for dep in env_info.dependencies]
-
-        if deps:
-            lines.append("# Install Python dependencies")
-            lines.append(f"RUN pip install --no-cache-dir {' '.join(deps)}")
-            lines.append("")
-
-    elif env_info.type == "conda":
+    if env_info.type in ("pip", "conda"):
         # For conda, we'd need conda installed in the base image
-        # For v0, convert conda deps to pip or use conda base image
-        lines.append("# Install conda dependencies")
-        lines.append("# Note: Converting conda deps to pip for v0")
-        deps = []
-        for dep in env_info.dependencies:
-            if dep.version:
-                # Conda dependencies may have '=' prefix (e.g., '=1.24.0')
-                # or pip-style operators (e.g., '>=2.0.0')
-                # Use format_for_pip() which handles all cases correctly
-                deps.append(dep.format_for_pip())
-            else:
-                deps.append(dep.name)
-
-        if deps:
-            lines.append(f"RUN pip install --no-cache-dir {' '.join(deps)}")
+        # For v0, conda deps are converted to pip requirements
+        if env_info.dependencies:
+            lines.append("# Install Python dependencies")
+            lines.append(f"COPY {REQUIREMENTS_FILENAME} /tmp/requirements.txt")
+            lines.append("RUN pip install --no-cache-dir -r /tmp/requirements.txt")
             lines.append("")
 
     elif env_info.type in ("poetry", "pipenv"):
@@ -144,7 +260,8 @@ def _generate_dockerfile(env_info: EnvironmentInfo, repo_path: Path | None = Non
             # Check if poetry.lock exists in repository (not in detected_files)
             if repo_path and (repo_path / "poetry.lock").exists():
                 lines.append("COPY poetry.lock .")  # Include lock file for reproducible builds
-            lines.append("RUN poetry install --no-dev")
+            # Source is copied later, so only install dependencies here
+            lines.append("RUN poetry install --no-root --no-dev")
             lines.append("")
         elif "Pipfile" in env_info.detected_files:
             lines.append("# Install Pipenv dependencies")
@@ -156,26 +273,77 @@ def _generate_dockerfile(env_info: EnvironmentInfo, repo_path: Path | None = Non
             lines.append("RUN pipenv install --deploy")
             lines.append("")
 
-    # Copy repository files
-    lines.append("# Copy repository files")
-    lines.append("COPY . .")
-    lines.append("")
+    return "".join(
+        [
+            _DOCKERFILE_PREAMBLE.format(
+                base_image=env_info.base_image, uid=settings.docker_user_uid, user=user
+            ),
+            *(f"{line}\n" for line in lines),
+            _DOCKERFILE_EPILOGUE.format(user=user),
+        ]
+    )
 
-    # Change ownership to non-root user
-    lines.append("# Change ownership to non-root user")
-    lines.append(f"RUN chown -R {settings.docker_user}:{settings.docker_user} /workspace")
-    lines.append("")
 
-    # Switch to non-root user
-    lines.append("# Switch to non-root user")
-    lines.append(f"USER {settings.docker_user}")
-    lines.append("")
+def _format_requirements(env_info: EnvironmentInfo) -> list[str]:
+    """
+    Format pip requirement lines for pip and conda environments.
 
-    # Default command (can be overridden)
-    lines.append("# Default command")
-    lines.append('CMD ["python", "--version"]')
+    Uses Dependency.format_for_pip() for each dependency. Repeated names
+    (case-insensitive) are emitted once: a versioned entry wins over an
+    unversioned one, otherwise the first is kept and conflicts are logged.
+    Lines are sorted so that reordering the detected dependencies does not
+    invalidate the install layer.
 
-    return "\n".join(lines)
+    Args:
+        env_info: Environment information
+
+    Returns:
+        Sorted requirement lines (empty for other environment types)
+    """
+    if env_info.type not in ("pip", "conda"):
+        return []
+    chosen: dict[str, Dependency] = {}
+    for dep in env_info.dependencies:
+        key = dep.name.lower()
+        kept = chosen.get(key)
+        if kept is None or (not kept.version and dep.version):
+            chosen[key] = dep
+        elif dep.version and dep.version != kept.version:
+            logger.warning(
+                f"Dropping duplicate dependency {dep.format_for_pip()}, "
+                f"keeping {kept.format_for_pip()}"
+            )
+    return [chosen[key].format_for_pip() for key in sorted(chosen)]
+
+
+def _move_cache_tag(client: docker.DockerClient, image_tag: str, cache_image: str) -> None:
+    """
+    Point the build cache tag at image_tag and delete the image it replaces.
+
+    The replaced image is only deleted once it has no tags left, i.e. its own job has
+    already removed the job tag; otherwise that job's cleanup_image deletes it later.
+    The image is already built, so Docker errors are logged rather than failing the build.
+    """
+    try:
+        try:
+            previous_id = client.api.inspect_image(cache_image)["Id"]
+        except ImageNotFound:
+            previous_id = None
+
+        repository, tag = parse_repository_tag(cache_image)
+        client.api.tag(image_tag, repository, tag or "latest")
+    except DockerException as e:
+        logger.warning(f"Failed to tag build cache image {cache_image}: {str(e)}")
+        return
+
+    if previous_id is None:
+        return
+    try:
+        if not client.api.inspect_image(previous_id).get("RepoTags"):
+            client.api.remove_image(previous_id)
+            logger.info(f"Removed previous build cache image: {previous_id}")
+    except DockerException as e:
+        logger.warning(f"Failed to remove previous build cache image {previous_id}: {str(e)}")
 
 
 def cleanup_image(image_tag: str, job_id: str) -> None:
@@ -187,8 +355,31 @@ def cleanup_image(image_tag: str, job_id: str) -> None:
         job_id: Job ID for logging
     """
     try:
-        client = docker.from_env()
+        client = _get_client()
         client.images.remove(image_tag, force=True)
         logger.info(f"Removed Docker image: {image_tag}")
     except Exception as e:
         logger.warning(f"Failed to remove Docker image {image_tag}: {str(e)}")
+
+
+def warm_base_image(base_image: str = DEFAULT_BASE_IMAGE) -> None:
+    """
+    Pull the base image if the daemon does not have it yet.
+
+    Called once at worker startup so the first build does not pull it inline.
+    Failures are only logged; a build still pulls a missing base image itself.
+
+    Args:
+        base_image: Image reference to pull (e.g., "python:3.11-slim")
+    """
+    try:
+        client = _get_client()
+        try:
+            client.images.get(base_image)
+            logger.info(f"Base image already present: {base_image}")
+        except ImageNotFound:
+            repository, tag = parse_repository_tag(base_image)
+            logger.info(f"Pulling base image: {base_image}")
+            client.images.pull(repository, tag=tag or "latest")
+    except Exception as e:
+        logger.warning(f"Failed to pre-pull base image {base_image}: {str(e)}")
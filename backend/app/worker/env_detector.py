@@ -1,6 +1,10 @@
 """Environment detection utilities."""
 
 import logging
+import os
+import re
+import tomllib
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -11,6 +15,22 @@ from app.utils.logging import log_step
 
 logger = logging.getLogger(__name__)
 
+# Base image for every detected environment type
+DEFAULT_BASE_IMAGE = "python:3.11-slim"
+
+# Pip version specifier operators.
+# IMPORTANT: The ordering matters! Longer operators must come first to ensure
+# correct matching (e.g., '>=' before '>'). Do not reorder.
+_VERSION_OPERATORS = ("==", ">=", "<=", "!=", "~=", ">", "<")
+
+# Pip requirement: name (with optional extras), first version operator, rest of the spec
+_REQUIREMENT_PATTERN = re.compile(
+    r"([A-Za-z0-9_.\-]+(?:\[[^\]]*\])?)\s*("
+    + "|".join(re.escape(operator) for operator in _VERSION_OPERATORS)
+    + r")\s*(.*)",
+    re.DOTALL,
+)
+
 
 class Dependency:
     """Represents a single dependency."""
@@ -43,10 +63,7 @@ class Dependency:
         # Check if version already starts with a version operator
         # This avoids adding a duplicate '==' if the version string already includes
         # an operator prefix (e.g., '>=2.0.0')
-        # IMPORTANT: The ordering of version_operators matters! Longer operators must come first
-        # to ensure correct matching (e.g., '>=' before '>'). Do not reorder.
-        version_operators = ("==", ">=", "<=", "!=", "~=", ">", "<")
-        if self.version.startswith(version_operators):
+        if self.version.startswith(_VERSION_OPERATORS):
             return f"{self.name}{self.version}"
         else:
             return f"{self.name}=={self.version}"
@@ -60,7 +77,7 @@ class EnvironmentInfo:
         env_type: str,
         dependencies: list[Dependency],
         detected_files: list[str],
-        base_image: str = "python:3.11-slim",
+        base_image: str = DEFAULT_BASE_IMAGE,
     ):
         self.type = env_type
         self.dependencies = dependencies
@@ -101,49 +118,27 @@ def detect_environment(repo_path: Path, job_id: str) -> EnvironmentInfo:
         detected_files: list[str] = []
         dependencies: list[Dependency] = []
         env_type: str | None = None
-        base_image = "python:3.11-slim"
-
-        # Check for requirements.txt (pip)
-        requirements_txt = repo_path / "requirements.txt"
-        if requirements_txt.exists():
-            detected_files.append("requirements.txt")
-            env_type = "pip"
-            dependencies = _parse_requirements_txt(requirements_txt)
-            logger.info(
-                f"Detected pip environment from requirements.txt: {len(dependencies)} dependencies"
-            )
-
-        # Check for environment.yml (conda)
-        environment_yml = repo_path / "environment.yml"
-        if environment_yml.exists():
-            detected_files.append("environment.yml")
-            if env_type is None:
-                env_type = "conda"
-                dependencies = _parse_environment_yml(environment_yml)
-                logger.info(
-                    f"Detected conda environment from environment.yml: {len(dependencies)} dependencies"
-                )
-
-        # Check for pyproject.toml (poetry/pip)
-        pyproject_toml = repo_path / "pyproject.toml"
-        if pyproject_toml.exists():
-            detected_files.append("pyproject.toml")
-            if env_type is None:
-                env_type = "poetry"
-                dependencies = _parse_pyproject_toml(pyproject_toml)
-                logger.info(
-                    f"Detected poetry/pip environment from pyproject.toml: {len(dependencies)} dependencies"
-                )
-
-        # Check for Pipfile (pipenv)
-        pipfile = repo_path / "Pipfile"
-        if pipfile.exists():
-            detected_files.append("Pipfile")
+        base_image = DEFAULT_BASE_IMAGE
+
+        # List the repository root once instead of one exists() call per file;
+        # is_file() follows symlinks, so dangling links are skipped like before
+        try:
+            with os.scandir(repo_path) as entries:
+                root_entries = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            root_entries = set()
+
+        # Only the highest-priority file is parsed; the others are just recorded
+        for filename, candidate_type, parser in _ENVIRONMENT_FILES:
+            if filename not in root_entries:
+                continue
+            detected_files.append(filename)
             if env_type is None:
-                env_type = "pipenv"
-                dependencies = _parse_pipfile(pipfile)
+                env_type = candidate_type
+                dependencies = parser(repo_path / filename)
                 logger.info(
-                    f"Detected pipenv environment from Pipfile: {len(dependencies)} dependencies"
+                    f"Detected {candidate_type} environment from {filename}: "
+                    f"{len(dependencies)} dependencies"
                 )
 
         if env_type is None:
@@ -151,6 +146,10 @@ def detect_environment(repo_path: Path, job_id: str) -> EnvironmentInfo:
                 "No environment files detected. Supported: requirements.txt, environment.yml, pyproject.toml, Pipfile"
             )
 
+        # Canonical order, so reordering a dependency file does not change the
+        # stored environment, report or notebook
+        dependencies.sort(key=lambda dep: (dep.name.lower(), dep.version or ""))
+
         return EnvironmentInfo(
             env_type=env_type,
             dependencies=dependencies,
@@ -196,42 +195,13 @@ def _parse_pip_dependency_string(spec: str) -> Dependency:
         Dependency object with name and version (including operator)
     """
     spec = spec.strip()
-    # Parse all valid pip version specifiers
-    # Check longer operators first to avoid false matches
-    if "==" in spec:
-        name, version = spec.split("==", 1)
-        return Dependency(name=name.strip(), version=f"=={version.strip()}")
-    elif ">=" in spec:
-        name, version = spec.split(">=", 1)
-        return Dependency(name=name.strip(), version=f">={version.strip()}")
-    elif "<=" in spec:
-        name, version = spec.split("<=", 1)
-        return Dependency(name=name.strip(), version=f"<={version.strip()}")
-    elif "!=" in spec:
-        name, version = spec.split("!=", 1)
-        return Dependency(name=name.strip(), version=f"!={version.strip()}")
-    elif "~=" in spec:
-        name, version = spec.split("~=", 1)
-        return Dependency(name=name.strip(), version=f"~={version.strip()}")
-    elif ">" in spec:
-        # Check that '>' is not part of '>=' by verifying position
-        # Since '>=' was already checked above, we know it's not present
-        # But verify at the split position to be safe
-        idx = spec.find(">")
-        if idx == 0 or (idx > 0 and spec[idx - 1] != "="):
-            name, version = spec.split(">", 1)
-            return Dependency(name=name.strip(), version=f">{version.strip()}")
-    elif "<" in spec:
-        # Check that '<' is not part of '<=' by verifying position
-        # Since '<=' was already checked above, we know it's not present
-        # But verify at the split position to be safe
-        idx = spec.find("<")
-        if idx == 0 or (idx > 0 and spec[idx - 1] != "="):
-            name, version = spec.split("<", 1)
-            return Dependency(name=name.strip(), version=f"<{version.strip()}")
-    else:
+    match = _REQUIREMENT_PATTERN.fullmatch(spec)
+    if match is None:
         # No version specified
-        return Dependency(name=spec.strip())
+        return Dependency(name=spec)
+
+    name, operator, version = match.groups()
+    return Dependency(name=name, version=f"{operator}{version.strip()}")
 
 
 def _parse_environment_yml(environment_path: Path) -> list[Dependency]:
@@ -277,10 +247,8 @@ def _parse_pyproject_toml(pyproject_path: Path) -> list[Dependency]:
     """Parse pyproject.toml file (poetry/pip)."""
     dependencies: list[Dependency] = []
     try:
-        import tomli
-
         with open(pyproject_path, "rb") as f:
-            data = tomli.load(f)
+            data = tomllib.load(f)
 
         # Check for poetry dependencies
         if "tool" in data and "poetry" in data["tool"]:
@@ -304,11 +272,6 @@ def _parse_pyproject_toml(pyproject_path: Path) -> list[Dependency]:
                     # Reuse pip dependency parsing logic to support all operators
                     dependencies.append(_parse_pip_dependency_string(dep))
 
-    except ImportError:
-        logger.warning("tomli not available, cannot parse pyproject.toml")
-        raise NoEnvironmentDetectedError(
-            "tomli required to parse pyproject.toml. Install with: pip install tomli"
-        )
     except Exception as e:
         logger.warning(f"Error parsing pyproject.toml: {e}")
         raise NoEnvironmentDetectedError(f"Failed to parse pyproject.toml: {str(e)}")
@@ -320,10 +283,8 @@ def _parse_pipfile(pipfile_path: Path) -> list[Dependency]:
     """Parse Pipfile (pipenv)."""
     dependencies: list[Dependency] = []
     try:
-        import tomli
-
         with open(pipfile_path, "rb") as f:
-            data = tomli.load(f)
+            data = tomllib.load(f)
 
         # Check for packages section
         packages = data.get("packages", {})
@@ -336,13 +297,17 @@ def _parse_pipfile(pipfile_path: Path) -> list[Dependency]:
             else:
                 dependencies.append(Dependency(name=name))
 
-    except ImportError:
-        logger.warning("tomli not available, cannot parse Pipfile")
-        raise NoEnvironmentDetectedError(
-            "tomli required to parse Pipfile. Install with: pip install tomli"
-        )
     except Exception as e:
         logger.warning(f"Error parsing Pipfile: {e}")
         raise NoEnvironmentDetectedError(f"Failed to parse Pipfile: {str(e)}")
 
     return dependencies
+
+
+# Environment files in detection priority order: (filename, env type, parser)
+_ENVIRONMENT_FILES: list[tuple[str, str, Callable[[Path], list[Dependency]]]] = [
+    ("requirements.txt", "pip", _parse_requirements_txt),
+    ("environment.yml", "conda", _parse_environment_yml),
+    ("pyproject.toml", "poetry", _parse_pyproject_toml),
+    ("Pipfile", "pipenv", _parse_pipfile),
+]
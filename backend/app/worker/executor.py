@@ -1,13 +1,23 @@
 """Command execution in Docker containers."""
 
+import codecs
 import logging
+import os
+import shutil
+import tempfile
+import threading
 import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import BinaryIO
 
 import docker
 from docker.errors import ContainerError, DockerException
 from pydantic import BaseModel
+from requests import RequestException
 
 from app.config import settings
 from app.utils.errors import ExecutionError, ExecutionTimeoutError
@@ -15,6 +25,94 @@ from app.utils.logging import log_step
 
 logger = logging.getLogger(__name__)
 
+# Errors a Docker API call can raise: daemon errors and transport failures
+_DOCKER_CALL_ERRORS = (DockerException, RequestException)
+
+# Write buffer for the combined log file; daemon log chunks are small, so this
+# batches them into few large writes
+_LOG_WRITE_BUFFER_BYTES = 1 << 20
+
+
+# Docker client shared by every call in this process (created on first use)
+_client: docker.DockerClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> docker.DockerClient:
+    """Return the process-wide Docker client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = docker.from_env()
+    return _client
+
+
+def _reset_client() -> None:
+    """Forget the parent's client in a forked child (its pooled sockets are not fork-safe)."""
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_client)
+
+
+@dataclass(slots=True, frozen=True)
+class SecurityConstraints:
+    """Container run limits derived from validated security settings."""
+
+    user: str
+    network_mode: str
+    cpu_quota: int
+    cpu_period: int
+    mem_limit: int
+    read_only: bool
+
+
+def validate_security_settings() -> SecurityConstraints:
+    """
+    Validate the container security settings and derive the run limits.
+
+    Called at worker startup so a misconfigured worker fails before taking a
+    job, and again before each container run since settings can be changed
+    at runtime.
+
+    Returns:
+        SecurityConstraints for containers.run()
+
+    Raises:
+        ExecutionError: If a security setting is missing or unsafe
+    """
+    docker_user_str = str(settings.docker_user or "").strip().lower()
+    docker_user_uid = getattr(settings, "docker_user_uid", None)
+    if (
+        not docker_user_str
+        or docker_user_str == "root"
+        or docker_user_str == "0"
+        or (docker_user_uid is not None and docker_user_uid == 0)
+    ):
+        raise ExecutionError("Security violation: containers must run as non-root user")
+    if settings.docker_cpu_limit <= 0:
+        raise ExecutionError("Security violation: CPU limit must be greater than 0")
+    if not settings.docker_memory_limit or settings.docker_memory_limit.strip() == "":
+        raise ExecutionError("Security violation: memory limit must be set")
+    if settings.docker_network_mode not in ("none", "bridge"):
+        raise ExecutionError(
+            f"Security violation: invalid network mode '{settings.docker_network_mode}'"
+        )
+
+    return SecurityConstraints(
+        user=settings.docker_user,
+        network_mode=settings.docker_network_mode,
+        # CPU limit (in nano CPUs: 2.0 cores = 2000000000)
+        cpu_quota=int(settings.docker_cpu_limit * 1_000_000_000),
+        cpu_period=1_000_000,  # Default period
+        # Memory limit (convert string like "4g" to bytes)
+        mem_limit=_parse_memory_limit(settings.docker_memory_limit),
+        read_only=bool(settings.docker_readonly_rootfs),
+    )
+
 
 class ExecutionResult(BaseModel):
     """Result of command execution."""
@@ -75,41 +173,14 @@ def execute_command(
         logs_file.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            # Initialize Docker client
-            client = docker.from_env()
-
             # Prepare volume mounts
             volumes = {
                 str(repo_path): {"bind": "/workspace", "mode": "ro"},  # Read-only repo
                 str(artifacts_dir): {"bind": "/artifacts", "mode": "rw"},  # Writable artifacts
             }
 
-            # Validate security constraints are set (BEFORE parsing/using them)
-            docker_user_str = str(settings.docker_user or "").strip().lower()
-            docker_user_uid = getattr(settings, "docker_user_uid", None)
-            if (
-                not docker_user_str
-                or docker_user_str == "root"
-                or docker_user_str == "0"
-                or (docker_user_uid is not None and docker_user_uid == 0)
-            ):
-                raise ExecutionError("Security violation: containers must run as non-root user")
-            if settings.docker_cpu_limit <= 0:
-                raise ExecutionError("Security violation: CPU limit must be greater than 0")
-            if not settings.docker_memory_limit or settings.docker_memory_limit.strip() == "":
-                raise ExecutionError("Security violation: memory limit must be set")
-            if settings.docker_network_mode not in ("none", "bridge"):
-                raise ExecutionError(
-                    f"Security violation: invalid network mode '{settings.docker_network_mode}'"
-                )
-
-            # Prepare security constraints
-            # CPU limit (in nano CPUs: 2.0 cores = 2000000000)
-            cpu_quota = int(settings.docker_cpu_limit * 1_000_000_000)
-            cpu_period = 1_000_000  # Default period
-
-            # Memory limit (convert string like "4g" to bytes)
-            memory_bytes = _parse_memory_limit(settings.docker_memory_limit)
+            # Validate security settings and derive the container limits from them
+            constraints = validate_security_settings()
 
             # Run container with security constraints
             logger.info(
@@ -126,63 +197,85 @@ def execute_command(
                 "image": image_tag,
                 "command": command,
                 "detach": True,
-                "user": settings.docker_user,
-                "network_mode": settings.docker_network_mode,
-                "cpu_quota": cpu_quota,
-                "cpu_period": cpu_period,
-                "mem_limit": memory_bytes,
+                "user": constraints.user,
+                "network_mode": constraints.network_mode,
+                "cpu_quota": constraints.cpu_quota,
+                "cpu_period": constraints.cpu_period,
+                "mem_limit": constraints.mem_limit,
                 "volumes": volumes,
                 "working_dir": "/workspace",
                 "remove": False,  # Keep container for logs
             }
 
             # Add read-only root filesystem if enabled
-            if settings.docker_readonly_rootfs:
+            if constraints.read_only:
                 run_kwargs["read_only"] = True
 
-            container = client.containers.run(**run_kwargs)
+            container = _get_client().containers.run(**run_kwargs)
 
-            # Wait for container with timeout
-            try:
-                wait_result = container.wait(timeout=timeout_seconds)
-                # container.wait() returns a dict with 'StatusCode' key according to Docker SDK
-                # According to Docker SDK documentation, this should always be a dict
-                assert isinstance(
-                    wait_result, dict
-                ), f"container.wait() returned unexpected type: {type(wait_result)}, value: {wait_result}"
-                exit_code = wait_result.get("StatusCode", 1)
-            except Exception as e:
-                # Container may have timed out or crashed
-                logger.warning(f"Container wait failed: {e}")
-                # Try to stop the container
-                try:
-                    container.stop(timeout=5)
-                except Exception:
-                    pass
-                # Check if it's a timeout
-                elapsed = time.time() - start_time
-                if elapsed >= timeout_seconds:
-                    raise ExecutionTimeoutError(
-                        f"Execution exceeded timeout of {timeout_seconds} seconds"
-                    )
-                raise ExecutionError(f"Container execution failed: {str(e)}")
-
-            # Get logs
-            stdout_logs = container.logs(stdout=True, stderr=False).decode(
-                "utf-8", errors="replace"
-            )
-            stderr_logs = container.logs(stdout=False, stderr=True).decode(
-                "utf-8", errors="replace"
-            )
+            # Follow both log streams while the container runs, so the logs are on
+            # disk when it exits; stderr is spooled to a temporary file and appended
+            # after the stdout section
+            max_log_size = settings.max_log_size_bytes
+            stdout_stream = container.logs(stdout=True, stderr=False, stream=True, follow=True)
+            stderr_stream = container.logs(stdout=False, stderr=True, stream=True, follow=True)
+            with (
+                logs_file.open("wb", buffering=_LOG_WRITE_BUFFER_BYTES) as log_out,
+                tempfile.TemporaryFile(dir=logs_file.parent) as stderr_spool,
+                ThreadPoolExecutor(max_workers=2, thread_name_prefix="container-logs") as readers,
+            ):
+                log_out.write(b"=== STDOUT ===\n")
+                stdout_reader = readers.submit(
+                    _stream_logs, stdout_stream, log_out, max_log_size // 2
+                )
+                stderr_reader = readers.submit(
+                    _stream_logs, stderr_stream, stderr_spool, max_log_size // 2
+                )
 
-            # Combine logs and write to file
-            combined_logs = f"=== STDOUT ===\n{stdout_logs}\n=== STDERR ===\n{stderr_logs}"
-            logs_file.write_text(combined_logs, encoding="utf-8")
+                # Wait for container with timeout: one blocking request to the daemon's
+                # wait endpoint, which answers when the container stops (no polling)
+                try:
+                    wait_result = container.wait(timeout=timeout_seconds, condition="not-running")
+                    # container.wait() returns a dict with 'StatusCode' key according to Docker SDK
+                    # According to Docker SDK documentation, this should always be a dict
+                    assert isinstance(
+                        wait_result, dict
+                    ), f"container.wait() returned unexpected type: {type(wait_result)}, value: {wait_result}"
+                    exit_code = wait_result.get("StatusCode", 1)
+                except Exception as e:
+                    # Container may have timed out or crashed
+                    logger.warning(f"Container wait failed: {e}")
+                    # Stop the container (kill it if that fails) so the log readers
+                    # reach the end of their streams
+                    try:
+                        container.stop(timeout=5)
+                    except _DOCKER_CALL_ERRORS:
+                        try:
+                            container.kill()
+                        except _DOCKER_CALL_ERRORS:
+                            # The container may still be running, so its followed
+                            # streams would never end: close them to let the
+                            # readers be joined
+                            stdout_stream.close()
+                            stderr_stream.close()
+                    # Check if it's a timeout
+                    elapsed = time.time() - start_time
+                    if elapsed >= timeout_seconds:
+                        raise ExecutionTimeoutError(
+                            f"Execution exceeded timeout of {timeout_seconds} seconds"
+                        )
+                    raise ExecutionError(f"Container execution failed: {str(e)}")
+
+                # The streams end when the container stops
+                stdout_head = stdout_reader.result()
+                stderr_head = stderr_reader.result()
+                log_out.write(b"\n=== STDERR ===\n")
+                stderr_spool.seek(0)
+                shutil.copyfileobj(stderr_spool, log_out, _LOG_WRITE_BUFFER_BYTES)
 
             # Truncate logs for DB storage
-            max_log_size = settings.max_log_size_bytes
-            stdout_truncated = _truncate_log(stdout_logs, max_log_size // 2)
-            stderr_truncated = _truncate_log(stderr_logs, max_log_size // 2)
+            stdout_truncated = _truncate_log(stdout_head, max_log_size // 2)
+            stderr_truncated = _truncate_log(stderr_head, max_log_size // 2)
 
             # Calculate duration
             duration_seconds = time.time() - start_time
@@ -228,6 +321,43 @@ def execute_command(
             raise ExecutionError(error_msg) from e
 
 
+def _stream_logs(log_stream: Iterable[bytes], log_out: BinaryIO, head_bytes: int) -> str:
+    """
+    Copy one container log stream (stdout or stderr) to an open log file.
+
+    The stream is followed until the container stops or the stream is closed. Chunks are written to
+    the file as raw bytes as they arrive, so memory use does not grow with the
+    log size and the log is never decoded and re-encoded. Only the head kept
+    for the preview is decoded (invalid UTF-8 is replaced).
+
+    Returns:
+        The start of the stream: all of it if it fits in head_bytes, otherwise
+        a prefix longer than head_bytes (enough for _truncate_log)
+    """
+    # Up to 3 trailing bytes of the head may be an incomplete character that is
+    # not decoded, so keep that much more to still decode past head_bytes
+    head_limit = head_bytes + 3
+    head: list[bytes] = []
+    head_size = 0
+    complete = True
+    for chunk in log_stream:
+        log_out.write(chunk)
+        if head_size <= head_limit:
+            head.append(chunk)
+            head_size += len(chunk)
+        else:
+            complete = False
+
+    # A head cut inside a multi-byte character keeps it pending instead of
+    # replacing it; only the real end of the stream is flushed
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return decoder.decode(b"".join(head), final=complete)
+
+
+# Bytes per memory limit unit suffix
+_MEMORY_UNITS = {"g": 1024 * 1024 * 1024, "m": 1024 * 1024, "k": 1024}
+
+
 def _parse_memory_limit(memory_str: str) -> int:
     """
     Parse memory limit string to bytes.
@@ -235,26 +365,28 @@ def _parse_memory_limit(memory_str: str) -> int:
     Supports: "4g", "512m", "1024", etc.
     """
     memory_str = memory_str.lower().strip()
-    if memory_str.endswith("g"):
-        return int(float(memory_str[:-1]) * 1024 * 1024 * 1024)
-    elif memory_str.endswith("m"):
-        return int(float(memory_str[:-1]) * 1024 * 1024)
-    elif memory_str.endswith("k"):
-        return int(float(memory_str[:-1]) * 1024)
-    else:
+    unit = _MEMORY_UNITS.get(memory_str[-1:])
+    if unit is None:
         # Assume bytes
         return int(memory_str)
+    return int(float(memory_str[:-1]) * unit)
 
 
 def _truncate_log(log_content: str, max_bytes: int) -> str:
     """Truncate log content to max_bytes, preserving UTF-8 encoding."""
-    if len(log_content.encode("utf-8")) <= max_bytes:
+    if not log_content:
+        return log_content
+    if max_bytes <= 0:
+        # Nothing fits; skip encoding (a negative slice would also cut from the end)
+        return "\n... [truncated]"
+
+    encoded = log_content.encode("utf-8")
+    if len(encoded) <= max_bytes:
         return log_content
 
-    # Truncate byte by byte until we fit
-    truncated = log_content
-    while len(truncated.encode("utf-8")) > max_bytes:
-        truncated = truncated[:-1]
+    # Cut the bytes once; only a multi-byte character split at the cut can be
+    # incomplete, and decoding with errors="ignore" drops it
+    truncated = encoded[:max_bytes].decode("utf-8", errors="ignore")
 
     # Add truncation indicator
     return truncated + "\n... [truncated]"
@@ -1,7 +1,10 @@
 """LLM client for Gemini API (supports both API key and Vertex AI)."""
 
+import json
 import logging
 import os
+import re
+import threading
 from typing import Any
 
 from app.config import settings
@@ -28,10 +31,44 @@ except ImportError:
     logger.debug("vertexai not available, will use API key only")
 
 
+# Optional ```json / ``` opening fence and ``` closing fence around LLM output
+_CODE_FENCE_PATTERN = re.compile(r"(?:```json)?(?:```)?(.*?)(?:```)?", re.DOTALL)
+
+# Client shared by every call in this process, with the settings it was built from
+_client: Any = None
+_client_key: tuple | None = None
+_client_lock = threading.Lock()
+
+
 def get_llm_client():
     """
     Get configured Gemini LLM client.
 
+    The client is created once per process and reused while the settings it
+    depends on are unchanged; if none can be created, the next call retries.
+
+    Returns:
+        Configured model client or None if not available
+    """
+    global _client, _client_key
+    key = (
+        settings.gemini_api_key,
+        settings.gemini_model,
+        settings.gcp_project_id,
+        os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
+    )
+    if _client is None or _client_key != key:
+        with _client_lock:
+            if _client is None or _client_key != key:
+                _client = _create_llm_client()
+                _client_key = key
+    return _client
+
+
+def _create_llm_client():
+    """
+    Create a Gemini LLM client.
+
     Tries API key first (direct Gemini API), then falls back to Vertex AI
     if GOOGLE_APPLICATION_CREDENTIALS is set.
 
@@ -125,26 +162,20 @@ def generate_structured_output(prompt: str, output_format: str = "json") -> dict
     Returns:
         Parsed JSON dict or None if generation failed
     """
-    import json
-
     text = generate_text(prompt, temperature=0.2)
     if not text:
         return None
 
     try:
-        # Try to extract JSON from response
         # Remove markdown code blocks if present
-        text = text.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
+        text = strip_code_fence(text)
         return json.loads(text)
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse LLM JSON output: {e}")
         logger.debug(f"LLM output: {text}")
         return None
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a markdown code fence (```json or ```) wrapped around LLM output."""
+    return _CODE_FENCE_PATTERN.fullmatch(text.strip()).group(1).strip()
@@ -1,12 +1,13 @@
 """Worker main entry point."""
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from uuid import UUID
 
 from redis import Redis
 from rq import Worker
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -23,10 +24,11 @@ from app.utils.errors import (
 )
 from app.utils.logging import log_event, log_step, setup_logging
 from app.worker.artifact_generator import generate_badge, generate_notebook, generate_report
-from app.worker.docker_builder import build_image, cleanup_image
+from app.worker.docker_builder import build_image, cleanup_image, warm_base_image
 from app.worker.env_detector import detect_environment
-from app.worker.executor import execute_command
+from app.worker.executor import execute_command, validate_security_settings
 from app.worker.repo_cloner import cleanup_repo, clone_repo
+from app.worker.tasks import JOB_TIMEOUT_SECONDS
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -47,6 +49,10 @@ def process_job(job_id: str):
     5. Execute command
     6. Generate artifacts (report, notebook, badge)
     7. Update status to completed/failed
+
+    Only a pending job is claimed, so a duplicate dispatch is skipped. A job left
+    running by a work-horse that was killed (OOM, RQ job timeout) is reclaimed once
+    it has been running for longer than JOB_TIMEOUT_SECONDS, e.g. by ``rq requeue``.
     """
     db: Session = SessionLocal()
     job = None
@@ -65,23 +71,38 @@ def process_job(job_id: str):
         # Convert job_id to UUID
         job_uuid = UUID(job_id) if isinstance(job_id, str) else job_id
 
-        # Get job from database
-        job = db.query(Job).filter(Job.id == job_uuid).first()
+        # Claim the pending (or abandoned running) job; the row lock (skipped by
+        # other workers on PostgreSQL) is held until the running status is committed,
+        # so a duplicate dispatch of the same job returns here instead of rerunning it.
+        # No horse outlives the RQ job timeout, so an older running row is stale.
+        stale_before = datetime.now(UTC) - timedelta(seconds=JOB_TIMEOUT_SECONDS)
+        job = (
+            db.query(Job)
+            .filter(
+                Job.id == job_uuid,
+                or_(
+                    Job.status == JobStatus.PENDING,
+                    and_(Job.status == JobStatus.RUNNING, Job.updated_at < stale_before),
+                ),
+            )
+            .with_for_update(skip_locked=True)
+            .first()
+        )
         if not job:
             log_event(
-                logging.ERROR,
-                "Job not found",
+                logging.WARNING,
+                "Job not found or already claimed",
                 job_id=job_id,
                 step="process_job",
-                event="job_not_found",
-                status="not_found",
+                event="job_not_claimed",
+                status="skipped",
             )
             return
 
         # Update status to running
         log_event(
             logging.INFO,
-            "Job status: pending -> running",
+            f"Job status: {job.status.value} -> running",
             job_id=job_id,
             step="status_transition",
             event="status_change",
@@ -89,6 +110,8 @@ def process_job(job_id: str):
         )
         job.status = JobStatus.RUNNING
         job.updated_at = datetime.now(UTC)
+        # Committed right away so the running status is visible; everything
+        # else is committed once with the final status
         db.commit()
 
         # Step 1: Clone repository
@@ -123,7 +146,6 @@ def process_job(job_id: str):
         )
         env_info = detect_environment(repo_path=repo_path, job_id=job_id)
         job.detected_environment = env_info.to_dict()
-        db.commit()
         log_event(
             logging.INFO,
             "Environment detection completed",
@@ -188,11 +210,10 @@ def process_job(job_id: str):
             duration_seconds=execution_result.duration_seconds,
         )
         db.add(run)
-        db.commit()
 
         # Step 6: Generate artifacts
         # Report
-        report_path = generate_report(
+        report_path, report_size = generate_report(
             job=job,
             run=run,
             env_info=env_info,
@@ -204,12 +225,11 @@ def process_job(job_id: str):
             type=ArtifactType.REPORT,
             format="markdown",
             content_path=str(report_path),
-            content_size=report_path.stat().st_size if report_path.exists() else None,
+            content_size=report_size,
         )
-        db.add(report_artifact)
 
         # Notebook
-        notebook_path = generate_notebook(
+        notebook_path, notebook_size = generate_notebook(
             job=job,
             env_info=env_info,
             output_path=artifacts_dir,
@@ -220,12 +240,11 @@ def process_job(job_id: str):
             type=ArtifactType.NOTEBOOK,
             format="ipynb",
             content_path=str(notebook_path),
-            content_size=notebook_path.stat().st_size if notebook_path.exists() else None,
+            content_size=notebook_size,
         )
-        db.add(notebook_artifact)
 
         # Badge
-        badge_path = generate_badge(
+        badge_path, badge_size = generate_badge(
             job=job,
             base_url=settings.api_base_url,
             output_path=artifacts_dir,
@@ -236,13 +255,11 @@ def process_job(job_id: str):
             type=ArtifactType.BADGE,
             format="markdown",
             content_path=str(badge_path),
-            content_size=badge_path.stat().st_size if badge_path.exists() else None,
+            content_size=badge_size,
         )
-        db.add(badge_artifact)
-
-        db.commit()
+        db.add_all([report_artifact, notebook_artifact, badge_artifact])
 
-        # Step 7: Update status to completed
+        # Step 7: Update status to completed (commits the run and artifacts too)
         with log_step(job_id, "status_transition", from_status="running", to_status="completed"):
             job.status = JobStatus.COMPLETED
             job.updated_at = datetime.now(UTC)
@@ -348,6 +365,12 @@ def main():
     logger.info("Starting RQ worker...")
     logger.info(f"Redis URL: {settings.redis_url}")
 
+    # Fail fast on unsafe container settings instead of failing every job
+    validate_security_settings()
+
+    # Make sure the first build does not have to pull the base image
+    warm_base_image()
+
     # Create worker
     worker = Worker(["default"], connection=redis_conn)
 
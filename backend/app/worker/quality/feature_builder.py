@@ -1,6 +1,7 @@
 """Feature builder for Quality Score model."""
 
 import logging
+import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -11,8 +12,37 @@ from app.worker.claim_extractor import Claim
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Paper text signals, matched against the lowercased text: (feature, literal substrings,
+# pattern for the phrases that need \s matching or None)
+_PAPER_SIGNALS = (
+    ("has_ablation", ("ablation", "ablative"), None),
+    ("has_baselines", ("baseline", "comparison"), re.compile(r"compared\s+to")),
+    (
+        "has_error_bars",
+        ("std",),
+        re.compile(r"error\s+bar|confidence\s+interval|standard\s+deviation"),
+    ),
+    ("has_seeds", ("seed",), re.compile(r"random[_\s]?state")),
+)
+
+# Repository signals
+_REPRO_README_PATTERN = re.compile(rb"reproduce|reproducibility|how\s+to\s+run", re.IGNORECASE)
+# Only the head of the README is scanned for repro instructions
+_MAX_README_SCAN_BYTES = 16 * 1024
+_REQUIREMENTS_FILES = frozenset(
+    {"requirements.txt", "pyproject.toml", "environment.yml", "Pipfile"}
+)
+_LOCK_FILES = frozenset({"poetry.lock", "Pipfile.lock", "package-lock.json"})
+_CI_FILES = frozenset({".gitlab-ci.yml", ".travis.yml", "circleci"})
+_LICENSE_FILES = frozenset({"LICENSE", "LICENSE.txt", "LICENSE.md"})
+_TEST_DIR_NAMES = frozenset({"test", "tests"})
+_SKIPPED_DIR_NAMES = frozenset({".git", "node_modules", "__pycache__", ".venv", "venv"})
+
+# Checklist items whose absence matters most: data, seeds, environment, commands
+_CRITICAL_CHECKLIST_KEYS = frozenset({"data_available", "seeds_fixed", "environment", "commands"})
+
+
+@dataclass(slots=True, frozen=True)
 class QualityFeatures:
     """Features for Quality Score prediction."""
 
@@ -64,8 +94,6 @@ def extract_paper_features(claims: list[Claim], paper_text: str) -> dict[str, An
     Returns:
         Dictionary of paper features
     """
-    import re
-
     features: dict[str, Any] = {}
 
     # Number of claims
@@ -82,29 +110,14 @@ def extract_paper_features(claims: list[Claim], paper_text: str) -> dict[str, An
         section: count / total_claims for section, count in claims_per_section.items()
     }
 
-    # Check for ablation studies
-    features["has_ablation"] = bool(
-        re.search(r"ablation|ablative", paper_text, re.IGNORECASE)
-    )
-
-    # Check for baselines
-    features["has_baselines"] = bool(
-        re.search(r"baseline|comparison|compared\s+to", paper_text, re.IGNORECASE)
-    )
-
-    # Check for error bars / confidence intervals
-    features["has_error_bars"] = bool(
-        re.search(
-            r"error\s+bar|confidence\s+interval|std|standard\s+deviation",
-            paper_text,
-            re.IGNORECASE,
+    # Check for ablation studies, baselines, error bars / confidence intervals and seeds.
+    # Plain substring tests on the lowercased text are much cheaper than case-insensitive
+    # regex scans; the regex only runs when no literal matched.
+    lowered = paper_text.lower()
+    for feature, literals, pattern in _PAPER_SIGNALS:
+        features[feature] = any(literal in lowered for literal in literals) or bool(
+            pattern and pattern.search(lowered)
         )
-    )
-
-    # Check for seeds
-    features["has_seeds"] = bool(
-        re.search(r"seed|random[_\s]?state", paper_text, re.IGNORECASE)
-    )
 
     return features
 
@@ -129,61 +142,86 @@ def extract_repo_features(repo_path: Path | None = None) -> dict[str, Any]:
         "has_license": False,
     }
 
-    if not repo_path or not repo_path.exists():
+    if not repo_path:
+        return features
+    try:
+        with os.scandir(repo_path) as entries:
+            root_names = {entry.name for entry in entries}
+    except OSError:
         return features
 
     # Check for requirements files
-    req_files = ["requirements.txt", "pyproject.toml", "environment.yml", "Pipfile"]
-    for req_file in req_files:
-        if (repo_path / req_file).exists():
-            features["has_requirements"] = True
-            break
+    features["has_requirements"] = not root_names.isdisjoint(_REQUIREMENTS_FILES)
 
     # Check for lock files
-    lock_files = ["poetry.lock", "Pipfile.lock", "package-lock.json"]
-    for lock_file in lock_files:
-        if (repo_path / lock_file).exists():
-            features["has_lock_file"] = True
-            break
-
-    # Check versions pinned (simple heuristic: check if requirements.txt has ==)
-    req_txt = repo_path / "requirements.txt"
-    if req_txt.exists():
-        content = req_txt.read_text()
-        pinned = len(re.findall(r"==|@", content))
-        total = len(re.findall(r"\n", content)) or 1
-        features["versions_pinned"] = min(pinned / total, 1.0)
+    features["has_lock_file"] = not root_names.isdisjoint(_LOCK_FILES)
+
+    # Check versions pinned: share of requirement lines with == or a direct (@) reference.
+    # Blank lines, comments and pip options (-r, --index-url, ...) are not requirements.
+    if "requirements.txt" in root_names:
+        content = (repo_path / "requirements.txt").read_text()
+        requirements = [
+            line
+            for line in map(str.strip, content.splitlines())
+            if line and not line.startswith(("#", "-"))
+        ]
+        if requirements:
+            pinned = sum(1 for line in requirements if "==" in line or "@" in line)
+            features["versions_pinned"] = pinned / len(requirements)
 
     # Check for CI
-    ci_dirs = [".github/workflows", ".gitlab-ci.yml", ".travis.yml", "circleci"]
-    for ci_dir in ci_dirs:
-        ci_path = repo_path / ci_dir
-        if ci_path.exists():
-            features["has_ci"] = True
-            break
+    features["has_ci"] = not root_names.isdisjoint(_CI_FILES) or (
+        ".github" in root_names and (repo_path / ".github" / "workflows").exists()
+    )
 
     # Check for tests
-    test_files = list(repo_path.rglob("test_*.py"))
-    if test_files:
-        features["has_tests"] = True
+    features["has_tests"] = _has_test_file(repo_path)
 
     # Check README for repro instructions
-    readme_path = repo_path / "README.md"
-    if readme_path.exists():
-        readme_text = readme_path.read_text()
-        if re.search(r"reproduce|reproducibility|how\s+to\s+run", readme_text, re.IGNORECASE):
+    if "README.md" in root_names:
+        with (repo_path / "README.md").open("rb") as readme_file:
+            readme_head = readme_file.read(_MAX_README_SCAN_BYTES)
+        if _REPRO_README_PATTERN.search(readme_head):
             features["has_repro_readme"] = True
 
     # Check for license
-    license_files = ["LICENSE", "LICENSE.txt", "LICENSE.md"]
-    for license_file in license_files:
-        if (repo_path / license_file).exists():
-            features["has_license"] = True
-            break
+    features["has_license"] = not root_names.isdisjoint(_LICENSE_FILES)
 
     return features
 
 
+def _has_test_file(root: Path) -> bool:
+    """
+    Check whether any test_*.py file exists under root.
+
+    Walks the tree depth-first and stops at the first hit. test/ and tests/ directories are
+    scanned before their siblings; VCS, virtualenv and cache directories are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                subdirs: list[str] = []
+                test_dirs: list[str] = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in _TEST_DIR_NAMES:
+                            test_dirs.append(entry.path)
+                        elif entry.name not in _SKIPPED_DIR_NAMES:
+                            subdirs.append(entry.path)
+                    elif (
+                        entry.name.startswith("test_")
+                        and entry.name.endswith(".py")
+                        and entry.is_file()
+                    ):
+                        return True
+        except OSError:
+            continue
+        stack.extend(subdirs)
+        stack.extend(test_dirs)
+    return False
+
+
 def extract_citation_features(
     citations_by_claim: dict[str, list[dict[str, Any]]],
     claims: list[Claim],
@@ -213,20 +251,28 @@ def extract_citation_features(
     )
     features["citation_coverage"] = claims_with_cites / len(claims) if claims else 0.0
 
+    all_citations = [cit for citations in citations_by_claim.values() for cit in citations]
+
     # Average citation relevance (average of score_final or score_rerank)
     all_scores = []
-    for citations in citations_by_claim.values():
-        for cit in citations:
-            score = cit.get("score_final") or cit.get("score_rerank") or 0.0
-            all_scores.append(score)
+    for cit in all_citations:
+        score = cit.get("score_final") or cit.get("score_rerank") or 0.0
+        all_scores.append(score)
 
     features["avg_citation_relevance"] = (
         sum(all_scores) / len(all_scores) if all_scores else 0.0
     )
 
-    # Citation diversity (simple: ratio of unique venues/authors)
-    # TODO: Implement more sophisticated diversity metric
-    features["citation_diversity"] = 0.5  # Placeholder
+    # Citation diversity: mean of the unique-venue and unique-first-author ratios
+    if all_citations:
+        venues = {(cit.get("venue") or "").strip().lower() for cit in all_citations}
+        first_authors = {
+            (cit["authors"][0] if cit.get("authors") else "").strip().lower()
+            for cit in all_citations
+        }
+        features["citation_diversity"] = (len(venues) + len(first_authors)) / (
+            2 * len(all_citations)
+        )
 
     return features
 
@@ -249,16 +295,14 @@ def extract_checklist_features(checklist: Checklist) -> dict[str, Any]:
     if not checklist.items:
         return features
 
-    ok_count = sum(1 for item in checklist.items if item.status == "ok")
+    ok_count = 0
+    missing_critical = 0
+    for item in checklist.items:
+        if item.status == "ok":
+            ok_count += 1
+        elif item.status == "missing" and item.key in _CRITICAL_CHECKLIST_KEYS:
+            missing_critical += 1
     features["checklist_pct_ok"] = ok_count / len(checklist.items)
-
-    # Critical items: data, seeds, environment, commands
-    critical_keys = ["data_available", "seeds_fixed", "environment", "commands"]
-    missing_critical = sum(
-        1
-        for item in checklist.items
-        if item.key in critical_keys and item.status == "missing"
-    )
     features["critical_items_missing"] = missing_critical
 
     return features
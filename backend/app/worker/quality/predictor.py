@@ -1,5 +1,6 @@
 """Quality Score predictor using ML model."""
 
+import functools
 import logging
 import pickle
 from pathlib import Path
@@ -9,10 +10,32 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Lazy loading of model
-_model = None
 _model_version = "v0.1.0"
 
+# Baseline heuristic: flags add their weight when set, the remaining features add
+# weight * value (fractions in 0-1, and a penalty per missing critical item)
+_BASELINE_SCORE = 50.0
+_BASELINE_FLAG_WEIGHTS = (
+    # Paper
+    ("has_ablation", 10),
+    ("has_baselines", 10),
+    ("has_error_bars", 5),
+    ("has_seeds", 5),
+    # Repo
+    ("has_requirements", 5),
+    ("has_lock_file", 5),
+    ("has_ci", 5),
+    ("has_tests", 5),
+    ("has_repro_readme", 5),
+    ("has_license", 5),
+)
+_BASELINE_SCALED_WEIGHTS = (
+    ("citation_coverage", 10),
+    ("checklist_pct_ok", 10),
+    # Penalties
+    ("critical_items_missing", -5),
+)
+
 
 def get_model_path() -> Path:
     """
@@ -26,29 +49,39 @@ def get_model_path() -> Path:
     return model_dir / "quality_score_v01.pkl"
 
 
+@functools.lru_cache(maxsize=1)
+def _load_model_file(model_path: Path, mtime_ns: int):
+    """
+    Unpickle the model file.
+
+    Cached on (path, mtime) so the model is deserialized once per process and
+    reloaded only when the file is replaced.
+    """
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    logger.info(f"Loaded quality score model from {model_path}")
+    return model
+
+
 def load_model():
     """
     Load quality score model from disk.
 
     Returns:
-        Trained model object (GradientBoostingRegressor or similar)
+        Trained model object (GradientBoostingRegressor or similar), or None if unavailable
     """
-    global _model
-
-    if _model is None:
-        model_path = get_model_path()
-        if model_path.exists():
-            try:
-                with open(model_path, "rb") as f:
-                    _model = pickle.load(f)
-                logger.info(f"Loaded quality score model from {model_path}")
-            except Exception as e:
-                logger.warning(f"Failed to load model: {e}, using baseline heuristic")
-                _model = None
-        else:
-            logger.warning(f"Model not found at {model_path}, using baseline heuristic")
+    model_path = get_model_path()
+    try:
+        mtime_ns = model_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        logger.warning(f"Model not found at {model_path}, using baseline heuristic")
+        return None
 
-    return _model
+    try:
+        return _load_model_file(model_path, mtime_ns)
+    except Exception as e:
+        logger.warning(f"Failed to load model: {e}, using baseline heuristic")
+        return None
 
 
 def predict_baseline(features: dict[str, Any]) -> float:
@@ -63,43 +96,12 @@ def predict_baseline(features: dict[str, Any]) -> float:
     Returns:
         Score (0-100)
     """
-    score = 50.0  # Base score
-
-    # Paper features (+10 each)
-    if features.get("has_ablation"):
-        score += 10
-    if features.get("has_baselines"):
-        score += 10
-    if features.get("has_error_bars"):
-        score += 5
-    if features.get("has_seeds"):
-        score += 5
-
-    # Repo features (+5 each)
-    if features.get("has_requirements"):
-        score += 5
-    if features.get("has_lock_file"):
-        score += 5
-    if features.get("has_ci"):
-        score += 5
-    if features.get("has_tests"):
-        score += 5
-    if features.get("has_repro_readme"):
-        score += 5
-    if features.get("has_license"):
-        score += 5
-
-    # Citations (+10 for coverage)
-    citation_coverage = features.get("citation_coverage", 0.0)
-    score += citation_coverage * 10
-
-    # Checklist (+10 for OK percentage)
-    checklist_pct = features.get("checklist_pct_ok", 0.0)
-    score += checklist_pct * 10
-
-    # Penalties
-    critical_missing = features.get("critical_items_missing", 0)
-    score -= critical_missing * 5
+    score = _BASELINE_SCORE
+    for feature, weight in _BASELINE_FLAG_WEIGHTS:
+        if features.get(feature):
+            score += weight
+    for feature, weight in _BASELINE_SCALED_WEIGHTS:
+        score += features.get(feature, 0) * weight
 
     # Clamp to 0-100
     score = max(0.0, min(100.0, score))
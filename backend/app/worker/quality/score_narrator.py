@@ -1,12 +1,19 @@
 """Score narrator agent: generates human-readable narrative from quality score and SHAP."""
 
+import json
 import logging
+import re
 from typing import Any
 
-from app.worker.llm_client import generate_text
+from app.worker.llm_client import generate_text, strip_code_fence
 
 logger = logging.getLogger(__name__)
 
+# Narrative JSON object embedded in a free-form LLM response
+_NARRATIVE_JSON_PATTERN = re.compile(
+    r'\{[^{}]*"executive_justification"[^{}]*\{[^{}]*\}', re.DOTALL
+)
+
 
 def generate_narrative(
     score: float,
@@ -82,24 +89,13 @@ JSON format:
         if not response:
             return None
 
-        # Parse JSON from response
-        import json
-        import re
-
         # Extract JSON from markdown code blocks if present
-        json_match = re.search(r'\{[^{}]*"executive_justification"[^{}]*\{[^{}]*\}', response, re.DOTALL)
+        json_match = _NARRATIVE_JSON_PATTERN.search(response)
         if json_match:
             json_str = json_match.group(0)
         else:
             # Try to find JSON object
-            json_str = response.strip()
-            if json_str.startswith("```json"):
-                json_str = json_str[7:]
-            if json_str.startswith("```"):
-                json_str = json_str[3:]
-            if json_str.endswith("```"):
-                json_str = json_str[:-3]
-            json_str = json_str.strip()
+            json_str = strip_code_fence(response)
 
         try:
             narrative = json.loads(json_str)
@@ -159,23 +155,29 @@ def _generate_narrative_heuristic(
     checklist: dict[str, Any],
 ) -> dict[str, Any]:
     """Generate narrative using heuristics (fallback)."""
-    # Top positive and negative factors
-    positive_factors = [item for item in shap_data if item.get("phi", 0) > 0][:3]
-    negative_factors = [item for item in shap_data if item.get("phi", 0) < 0][:3]
+    # Top positive and negative factors (shap_data is ordered by |phi|, so the first of each sign)
+    top_positive = None
+    top_negative = None
+    for item in shap_data:
+        phi = item.get("phi", 0)
+        if phi > 0:
+            top_positive = top_positive or item
+        elif phi < 0:
+            top_negative = top_negative or item
+        if top_positive and top_negative:
+            break
 
     executive = [
         f"Quality score of {score:.1f} (Tier {tier}) reflects the paper's methodological transparency and reproducibility evidence.",
     ]
 
-    if positive_factors:
-        top_positive = positive_factors[0]
+    if top_positive:
         executive.append(
             f"Strongest positive factor: {top_positive.get('feature', 'unknown')} "
             f"(contribution: +{top_positive.get('phi', 0):.1f})."
         )
 
-    if negative_factors:
-        top_negative = negative_factors[0]
+    if top_negative:
         executive.append(
             f"Main area for improvement: {top_negative.get('feature', 'unknown')} "
             f"(contribution: {top_negative.get('phi', 0):.1f})."
@@ -16,6 +16,8 @@ def get_embedding_model():
     Get or initialize the embedding model.
 
     Uses all-MiniLM-L6-v2 (384 dim) for speed, or e5-base (768 dim) if configured.
+    Runs on PyTorch by default; RAG_EMBEDDING_BACKEND=onnx (optionally with an INT8-quantized
+    RAG_EMBEDDING_MODEL_FILE) or openvino selects a faster CPU inference backend.
 
     Returns:
         SentenceTransformer model
@@ -27,8 +29,15 @@ def get_embedding_model():
             from sentence_transformers import SentenceTransformer
 
             model_name = getattr(settings, "rag_embedding_model", "all-MiniLM-L6-v2")
-            logger.info(f"Loading embedding model: {model_name}")
-            _model = SentenceTransformer(model_name)
+            backend = settings.rag_embedding_backend
+            # Only pass backend options when asked for, so older sentence-transformers keep working
+            model_options = {}
+            if backend != "torch":
+                model_options["backend"] = backend
+                if settings.rag_embedding_model_file:
+                    model_options["model_kwargs"] = {"file_name": settings.rag_embedding_model_file}
+            logger.info(f"Loading embedding model: {model_name} (backend: {backend})")
+            _model = SentenceTransformer(model_name, **model_options)
             logger.info(f"Embedding model loaded: {model_name}")
         except ImportError:
             logger.error("sentence-transformers not available, embeddings will fail")
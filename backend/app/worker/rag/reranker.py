@@ -1,8 +1,11 @@
 """Re-ranking using cross-encoder."""
 
 import logging
+from pathlib import Path
 from typing import Any
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Lazy loading of cross-encoder
@@ -13,7 +16,9 @@ def get_reranker_model():
     """
     Get or initialize the cross-encoder reranker model.
 
-    Uses cross-encoder/ms-marco-MiniLM-L-6-v2 for speed.
+    Uses cross-encoder/ms-marco-MiniLM-L-6-v2 for speed. Runs on PyTorch by default;
+    RAG_RERANKER_BACKEND=onnx with RAG_RERANKER_ONNX_PROVIDER selects an ONNX Runtime provider.
+    Older sentence-transformers without CrossEncoder backends (<4.1) stay on PyTorch.
 
     Returns:
         CrossEncoder model
@@ -25,8 +30,24 @@ def get_reranker_model():
             from sentence_transformers import CrossEncoder
 
             model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
-            logger.info(f"Loading reranker model: {model_name}")
-            _model = CrossEncoder(model_name)
+            backend = settings.rag_reranker_backend
+            logger.info(f"Loading reranker model: {model_name} (backend: {backend})")
+            options = _backend_options(backend)
+            # Create the TensorRT engine cache only when a model is actually loaded
+            provider_options = options.get("model_kwargs", {}).get("provider_options", {})
+            if "trt_engine_cache_path" in provider_options:
+                Path(provider_options["trt_engine_cache_path"]).mkdir(parents=True, exist_ok=True)
+            try:
+                _model = CrossEncoder(model_name, **options)
+            except TypeError:
+                # CrossEncoder only accepts backend/model_kwargs from sentence-transformers 4.1
+                if not options:
+                    raise
+                logger.warning(
+                    f"Reranker backend {backend} needs sentence-transformers>=4.1, "
+                    "falling back to torch"
+                )
+                _model = CrossEncoder(model_name)
             logger.info(f"Reranker model loaded: {model_name}")
         except ImportError:
             logger.warning("sentence-transformers CrossEncoder not available, reranking will be skipped")
@@ -35,6 +56,36 @@ def get_reranker_model():
     return _model
 
 
+def _backend_options(backend: str) -> dict[str, Any]:
+    """
+    Build the CrossEncoder keyword arguments for the configured inference backend.
+
+    Nothing is passed for torch, so older sentence-transformers keep working. TensorRT
+    engines are built in FP16 and cached on disk, so only the first load pays for the build.
+    """
+    provider = settings.rag_reranker_onnx_provider
+    if provider and backend != "onnx":
+        logger.warning(
+            f"RAG_RERANKER_ONNX_PROVIDER={provider} is ignored with the {backend} reranker backend"
+        )
+
+    if backend == "torch":
+        return {}
+
+    options: dict[str, Any] = {"backend": backend}
+    if backend == "onnx" and provider:
+        model_kwargs: dict[str, Any] = {"provider": provider}
+        if provider == "TensorrtExecutionProvider":
+            engine_cache = settings.artifacts_base_path / "rag" / "trt"
+            model_kwargs["provider_options"] = {
+                "trt_fp16_enable": True,
+                "trt_engine_cache_enable": True,
+                "trt_engine_cache_path": str(engine_cache),
+            }
+        options["model_kwargs"] = model_kwargs
+    return options
+
+
 def rerank(
     query: str,
     candidates: list[dict[str, Any]],  # List of {title, abstract, ...}
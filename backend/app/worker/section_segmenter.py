@@ -1,6 +1,7 @@
 """Section segmentation for scientific papers."""
 
 import re
+from collections.abc import Collection
 from typing import NamedTuple
 
 logger = None  # Will be set by module import
@@ -28,13 +29,33 @@ SECTION_PATTERNS = [
     (r"^\s*(?:Appendix|Appendices)\s*$", "appendix"),
 ]
 
+# Any section heading, for checking whether a paper has sections without segmenting it
+_ANY_HEADING = re.compile(
+    "|".join(f"(?:{pattern})" for pattern, _ in SECTION_PATTERNS), re.IGNORECASE
+)
 
-def segment_paper(text: str) -> list[Section]:
+
+def has_sections(text: str) -> bool:
+    """
+    Check whether the text has at least one section heading.
+
+    Args:
+        text: Full paper text
+
+    Returns:
+        True if segment_paper(text) would find any section
+    """
+    return any(_ANY_HEADING.match(line.strip()) for line in text.split("\n"))
+
+
+def segment_paper(text: str, keep: Collection[str] | None = None) -> list[Section]:
     """
     Segment paper text into sections.
 
     Args:
         text: Full paper text
+        keep: Optional section names to return. Other sections are skipped
+            without collecting their lines or computing offsets.
 
     Returns:
         List of Section objects
@@ -74,9 +95,12 @@ def segment_paper(text: str) -> list[Section]:
 
             # Start new section
             current_section = matched_section
+            if keep is not None and current_section not in keep:
+                current_lines = []
+                continue
             current_start = sum(len(line_item) + 1 for line_item in lines[:i])  # +1 for newline
             current_lines = [line]
-        else:
+        elif keep is None or current_section in keep:
             current_lines.append(line)
 
     # Add final section
@@ -7,10 +7,14 @@ from app.config import settings
 # Initialize Redis connection
 redis_conn = Redis.from_url(settings.redis_url)
 
+# RQ kills a job's work-horse after this long, so a job still marked running
+# for longer than this was abandoned (see process_job)
+JOB_TIMEOUT_SECONDS = 3600  # 1 hour
+
 
 def enqueue_job_task(job_id: str):
     """Enqueue a job processing task."""
     from rq import Queue
 
     queue = Queue("default", connection=redis_conn)
-    queue.enqueue("app.worker.main.process_job", job_id, job_timeout=3600)  # 1 hour timeout
+    queue.enqueue("app.worker.main.process_job", job_id, job_timeout=JOB_TIMEOUT_SECONDS)
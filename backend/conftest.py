@@ -16,3 +16,16 @@ def pytest_addoption(parser):
         # Option already exists or parser does not support addoption
         pass
 
+
+@pytest.fixture(autouse=True)
+def reset_cached_clients():
+    """Drop the cached Docker and LLM clients so each test sees its own mocks."""
+    from app.worker import docker_builder, executor, llm_client
+
+    docker_builder._client = None
+    executor._client = None
+    llm_client._client = None
+    yield
+    docker_builder._client = None
+    executor._client = None
+    llm_client._client = None
@@ -0,0 +1,109 @@
+"""Tests for artifact generation (report, notebook, badge)."""
+
+import json
+import uuid
+from pathlib import Path
+
+from app.models.job import Job, JobStatus
+from app.models.run import Run
+from app.worker.artifact_generator import generate_badge, generate_notebook, generate_report
+from app.worker.env_detector import Dependency, EnvironmentInfo
+
+
+def _make_job(**kwargs) -> Job:
+    defaults = {
+        "id": uuid.uuid4(),
+        "repo_url": "https://github.com/example/repo",
+        "status": JobStatus.COMPLETED,
+    }
+    defaults.update(kwargs)
+    return Job(**defaults)
+
+
+def _make_env() -> EnvironmentInfo:
+    return EnvironmentInfo(
+        env_type="pip",
+        dependencies=[Dependency("numpy", "==1.24.0"), Dependency("pandas")],
+        detected_files=["requirements.txt"],
+    )
+
+
+def test_generate_report_sections(tmp_path: Path):
+    """Test that the report contains metadata, dependencies and logs."""
+    job = _make_job(arxiv_id="2401.00001", run_command="python main.py")
+    run = Run(
+        exit_code=0,
+        stdout="hello\nworld",
+        stderr=None,
+        logs_path="/artifacts/logs/run.log",
+        duration_seconds=1.5,
+    )
+
+    report_file, report_size = generate_report(job, run, _make_env(), tmp_path, job_id="test-job")
+    content = report_file.read_text(encoding="utf-8")
+
+    assert report_size == report_file.stat().st_size
+
+    assert content.startswith("# Reproducibility Report\n\n**Generated:** ")
+    assert f"- **Job ID:** `{job.id}`\n" in content
+    assert "- **Duration:** 1.50s\n- **arXiv ID:** 2401.00001\n" in content
+    assert "- **Command:** `python main.py`\n\n## Environment Summary\n" in content
+    assert "### Dependencies\n\n- `numpy==1.24.0`\n- `pandas`\n\n## Execution Results" in content
+    assert "**Exit Code:** 0\n**Duration:** 1.50 seconds\n" in content
+    assert "### Standard Output\n\n```\nhello\nworld\n```\n" in content
+    assert "### Standard Error\n\n```\n(no errors)\n```\n" in content
+    assert content.endswith("---\n\n*Full logs available at: /artifacts/logs/run.log*")
+
+
+def test_generate_report_without_optional_fields(tmp_path: Path):
+    """Test report rendering when optional job/run fields are missing."""
+    job = _make_job()
+    run = Run(exit_code=None, stdout=None, stderr=None, logs_path=None)
+    env_info = EnvironmentInfo(env_type="pip", dependencies=[], detected_files=[])
+
+    report_file, _ = generate_report(job, run, env_info, tmp_path, job_id="test-job")
+    content = report_file.read_text()
+
+    assert "arXiv ID" not in content
+    assert "**Command:**" not in content
+    assert "- No dependencies detected" in content
+    assert "**Status:** ⏳ ⏳ In Progress" in content
+    assert "**Exit Code:**" not in content
+    assert "```\n(no output)\n```" in content
+    assert content.endswith("```\n\n---\n\n")
+
+
+def test_generate_notebook_is_valid_compact_json(tmp_path: Path):
+    """Test that the notebook is valid nbformat 4 JSON written without indentation."""
+    job = _make_job(run_command="python train.py")
+
+    notebook_file, notebook_size = generate_notebook(job, _make_env(), tmp_path, job_id="test-job")
+    raw = notebook_file.read_text(encoding="utf-8")
+    notebook = json.loads(raw)
+
+    assert notebook_size == notebook_file.stat().st_size
+    assert "\n " not in raw
+    assert notebook["nbformat"] == 4
+    assert len(notebook["cells"]) == 3
+    assert "pip install numpy==1.24.0 pandas\n" in notebook["cells"][1]["source"]
+    assert notebook["cells"][2]["source"] == ["# Execute: python train.py\n", "!python train.py\n"]
+
+
+def test_generate_badge_status_mapping(tmp_path: Path):
+    """Test badge label/color for each job status."""
+    expected = {
+        JobStatus.COMPLETED: "Reproducible-green",
+        JobStatus.FAILED: "Failed-red",
+        JobStatus.RUNNING: "Running-yellow",
+        JobStatus.PENDING: "Pending-gray",
+    }
+    for status, label in expected.items():
+        job = _make_job(status=status)
+        badge_file, badge_size = generate_badge(job, "https://arandu.dev", tmp_path, job_id="test-job")
+        badge = badge_file.read_text()
+
+        assert badge == (
+            f"[![{label.split('-')[0]}](https://img.shields.io/badge/Reproducibility-{label})]"
+            f"(https://arandu.dev/jobs/{job.id})"
+        )
+        assert badge_size == len(badge)
@@ -97,3 +97,14 @@ def test_get_badge_snippet():
     assert "claim-mapped" in snippet
     assert ".svg" in snippet
 
+
+def test_generate_badge_svg_is_independent_of_review():
+    """Test that badges for the same status render identically (and are cached)."""
+    svg_a = generate_badge_svg("method-check", "partial", "review-a")
+    svg_b = generate_badge_svg("method-check", "partial", "review-b", "https://arandu.dev")
+    assert svg_a is svg_b
+    assert "Method-check: Partial" in svg_a
+
+    assert "Method-check: Fail" in generate_badge_svg("method-check", True, "review-a")
+    assert "No citations" in generate_badge_svg("citations-augmented", "ok", "review-a")
+    assert "Unknown" in generate_badge_svg("other", True, "review-a")
@@ -104,3 +104,72 @@ def test_generate_checklist():
     ok_items = [item for item in checklist.items if item.status == "ok"]
     assert len(ok_items) > 0
 
+
+def test_scan_paper_overlapping_matches():
+    """Test that the fused paper scan reports overlapping matches of different patterns."""
+    from app.worker.checklist_generator import scan_paper
+
+    matches = scan_paper("The dataset: https://example.com/dataset is public. Seed: 7.")
+
+    assert matches["data_0"] == "dataset: https://"
+    assert matches["data_2"] == "https://example.com/data"
+    assert matches["seed_0"] == "Seed: 7"
+    assert "metric_0" not in matches
+
+
+def test_check_seeds_fixed_in_repo_code(tmp_path):
+    """Test seed detection in repository code, skipping oversized files."""
+    repo_path = tmp_path / "test-repo"
+    (repo_path / "src").mkdir(parents=True)
+    (repo_path / "src" / "big.py").write_text("x = 1\n" * 50_000 + "seed = 1\n")
+
+    item = check_seeds_fixed("No seeds mentioned.", repo_path)
+    assert item.status == "missing"
+
+    (repo_path / "src" / "train.py").write_text("torch.manual_seed(0)\nrandom_state = 42\n")
+    item = check_seeds_fixed("No seeds mentioned.", repo_path)
+    assert item.status == "ok"
+    assert item.evidence == "Found seed setting in train.py"
+
+
+def test_license_from_non_utf8_readme(tmp_path):
+    """Test that README keyword checks work on raw bytes (no UTF-8 decoding)."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+    (repo_path / "README.md").write_bytes("Licença: see the license section.\n".encode("latin-1"))
+
+    item = check_license(repo_path)
+    assert item.status == "partial"
+    assert item.evidence == "License mentioned in README"
+
+
+def test_check_source_tracks_evidence_origin(tmp_path):
+    """Test that source reflects where the evidence came from, not the evidence wording."""
+    item = check_data_available("The dataset is available at https://example.com/data")
+    assert item.source == "paper"
+
+    repo_path = tmp_path / "paper-repo"
+    (repo_path / "data").mkdir(parents=True)
+    item = check_data_available("No links here.", repo_path)
+    assert item.evidence == "Found data/ directory in repo"
+    assert item.source == "repo"
+
+    item = check_seeds_fixed("We use seed: 42 throughout the paper.")
+    assert item.source == "paper"
+
+
+def test_scan_repo_facts(tmp_path):
+    """Test that scan_repo lists the root and reads the README once."""
+    from app.worker.checklist_generator import scan_repo
+
+    assert scan_repo(None).root_entries is None
+    assert scan_repo(tmp_path / "missing").root_entries is None
+
+    repo_path = tmp_path / "test-repo"
+    (repo_path / "data").mkdir(parents=True)
+    (repo_path / "README.md").write_text("Run python main.py")
+
+    facts = scan_repo(repo_path)
+    assert facts.root_entries == {"data": True, "README.md": False}
+    assert facts.readme == b"Run python main.py"
+    assert check_license(repo_path, facts).status == "missing"
@@ -1,6 +1,8 @@
 """Tests for claim extraction."""
 
 
+import pytest
+
 from app.worker.claim_extractor import (
     Claim,
     _split_sentences,
@@ -88,3 +90,69 @@ def test_extract_claims_minimum_length():
     assert len(claims) >= 1
     assert all(len(claim.text) >= 20 for claim in claims)
 
+
+def test_extract_claims_spans_match_text():
+    """Test that claim spans point at the claim text, including repeated sentences."""
+    text = "Intro text here. We show that it works well.  We show that it works well."
+    claims = extract_claims_baseline(text)
+    assert len(claims) == 2
+    for claim in claims:
+        start, end = claim.spans[0]
+        assert text[start:end] == claim.text
+    assert claims[0].spans != claims[1].spans
+
+
+def test_extract_claims_by_section_deduplicates():
+    """Test that a claim repeated across sections is only kept once."""
+    text = """
+    Introduction
+    We show that our method achieves 95% accuracy.
+
+    Results
+    We show that our method achieves 95% accuracy.
+    Our approach significantly outperforms baselines.
+    """
+    claims = extract_claims_by_section(text)
+    texts = [claim.text.lower() for claim in claims]
+    assert len(texts) == len(set(texts))
+
+    seen: set[str] = set()
+    first = extract_claims_baseline("We show that it works well.", seen=seen)
+    second = extract_claims_baseline("We show that it works well.", seen=seen)
+    assert len(first) == 1
+    assert second == []
+
+
+def test_extract_claims_hyperscan_matches_re(monkeypatch):
+    """Test that the hyperscan scan finds the same claims as the re fallback."""
+    pytest.importorskip("hyperscan")
+    from app.worker import claim_extractor
+
+    text = (
+        "We show that our method achieves 95% accuracy. This is just a plain sentence here! "
+        "Our approach significantly outperforms baselines? The model is state-of-the-art.\n"
+        "We present a new benchmark for evaluation.Short one. Our contribution is clear."
+    )
+    monkeypatch.setattr(claim_extractor, "HYPERSCAN_AVAILABLE", True)
+    fast = extract_claims_baseline(text)
+    monkeypatch.setattr(claim_extractor, "HYPERSCAN_AVAILABLE", False)
+    assert fast == extract_claims_baseline(text)
+    assert len(fast) == 5
+
+
+def test_extract_claims_by_section_segments_once(monkeypatch):
+    """Test that only the claim sections are segmented, once, even when falling back."""
+    from app.worker import claim_extractor
+
+    calls = []
+    segment_paper = claim_extractor.segment_paper
+    monkeypatch.setattr(
+        claim_extractor,
+        "segment_paper",
+        lambda text, **kwargs: calls.append(kwargs) or segment_paper(text, **kwargs),
+    )
+
+    claims = extract_claims_by_section("We show that our method improves accuracy by 10%.")
+
+    assert len(claims) == 1
+    assert calls == [{"keep": claim_extractor._CLAIM_SECTIONS}]
@@ -1,12 +1,26 @@
 """Tests for Docker image building."""
 
+import errno
+import os
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from docker.errors import DockerException, ImageNotFound
+from docker.utils.build import exclude_paths
 
+from app.config import settings
 from app.utils.errors import DockerBuildError
-from app.worker.docker_builder import _generate_dockerfile, build_image
+from app.worker import docker_builder
+from app.worker.docker_builder import (
+    REQUIREMENTS_FILENAME,
+    _build_slot,
+    _format_requirements,
+    _generate_dockerfile,
+    build_image,
+    warm_base_image,
+)
 from app.worker.env_detector import Dependency, EnvironmentInfo
 
 
@@ -25,10 +39,45 @@ def test_generate_dockerfile_pip():
 
     assert "FROM python:3.11-slim" in dockerfile
     assert "useradd -m -u 1000 arandu-user" in dockerfile
-    assert "numpy==1.24.0" in dockerfile
-    assert "pandas" in dockerfile
+    assert f"COPY {REQUIREMENTS_FILENAME} /tmp/requirements.txt" in dockerfile
+    assert "RUN pip install --no-cache-dir -r /tmp/requirements.txt" in dockerfile
     assert "USER arandu-user" in dockerfile
     assert "WORKDIR /workspace" in dockerfile
+    # Dependencies are installed before the source is copied
+    assert dockerfile.index("pip install") < dockerfile.index("COPY . .")
+    assert _format_requirements(env_info) == ["numpy==1.24.0", "pandas"]
+
+
+def test_format_requirements_sorted():
+    """Test that requirement lines are sorted independently of detection order."""
+    env_info = EnvironmentInfo(
+        env_type="conda",
+        dependencies=[
+            Dependency("scipy"),
+            Dependency("Pandas", ">=2.0.0"),
+            Dependency("numpy", "1.24.0"),
+        ],
+        detected_files=["environment.yml"],
+    )
+
+    assert _format_requirements(env_info) == ["numpy==1.24.0", "Pandas>=2.0.0", "scipy"]
+
+
+def test_format_requirements_deduplicates():
+    """Test that repeated dependency names are emitted once."""
+    env_info = EnvironmentInfo(
+        env_type="pip",
+        dependencies=[
+            Dependency("numpy"),
+            Dependency("NumPy", "==1.24.0"),
+            Dependency("numpy", "==1.25.0"),
+            Dependency("pandas"),
+            Dependency("pandas"),
+        ],
+        detected_files=["requirements.txt"],
+    )
+
+    assert _format_requirements(env_info) == ["NumPy==1.24.0", "pandas"]
 
 
 def test_generate_dockerfile_conda():
@@ -62,7 +111,7 @@ def test_generate_dockerfile_poetry():
     assert "FROM python:3.11-slim" in dockerfile
     assert "pip install poetry" in dockerfile
     assert "COPY pyproject.toml ." in dockerfile
-    assert "poetry install --no-dev" in dockerfile
+    assert "poetry install --no-root --no-dev" in dockerfile
     assert "USER arandu-user" in dockerfile
 
 
@@ -82,16 +131,44 @@ def test_build_image_success(mock_docker_client, tmp_path: Path):
 
     # Mock Docker client
     mock_client = MagicMock()
-    mock_image = MagicMock()
-    mock_client.images.build.return_value = (mock_image, [{"stream": "Successfully built"}])
+    mock_client.api.build.return_value = iter([{"stream": "Successfully built"}])
     mock_docker_client.return_value = mock_client
 
     # Build image
     image_tag = build_image(repo_path, env_info, job_id="test-job-1")
 
     assert image_tag == "arandu-job-test-job-1:latest"
-    mock_client.images.build.assert_called_once()
+    mock_client.api.build.assert_called_once()
+    assert mock_client.api.build.call_args.kwargs["cache_from"] == ["arandu-job-cache:latest"]
+    mock_client.api.tag.assert_called_once_with(image_tag, "arandu-job-cache", "latest")
     assert (repo_path / "Dockerfile.arandu").exists()
+    assert (repo_path / REQUIREMENTS_FILENAME).read_text() == "numpy==1.24.0\n"
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_build_image_writes_dockerignore(mock_docker_client, tmp_path: Path):
+    """Test that a default .dockerignore trims the context without replacing the repo's own."""
+    repo_path = tmp_path / "test-repo"
+    (repo_path / ".git").mkdir(parents=True)
+    (repo_path / "main.py").write_text("print('hello')")
+    env_info = EnvironmentInfo(
+        env_type="pip", dependencies=[Dependency("numpy")], detected_files=["requirements.txt"]
+    )
+
+    mock_client = MagicMock()
+    mock_client.api.build.side_effect = lambda **kwargs: iter([])
+    mock_docker_client.return_value = mock_client
+
+    build_image(repo_path, env_info, job_id="test-job-6")
+
+    patterns = (repo_path / ".dockerignore").read_text().splitlines()
+    context = exclude_paths(str(repo_path), patterns, dockerfile="Dockerfile.arandu")
+    assert ".git" not in context
+    assert {"main.py", "Dockerfile.arandu", REQUIREMENTS_FILENAME} <= context
+
+    (repo_path / ".dockerignore").write_text("data/\n")
+    build_image(repo_path, env_info, job_id="test-job-7")
+    assert (repo_path / ".dockerignore").read_text() == "data/\n"
 
 
 @patch("app.worker.docker_builder.docker.from_env")
@@ -112,9 +189,161 @@ def test_build_image_failure(mock_docker_client, tmp_path: Path):
     # Mock Docker client to raise BuildError
     mock_client = MagicMock()
     build_error = docker.errors.BuildError("Build failed", [])
-    mock_client.images.build.side_effect = build_error
+    mock_client.api.build.side_effect = build_error
     mock_docker_client.return_value = mock_client
 
     # Build image should raise DockerBuildError
     with pytest.raises(DockerBuildError, match="Docker build failed"):
         build_image(repo_path, env_info, job_id="test-job-2")
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_build_image_error_event(mock_docker_client, tmp_path: Path):
+    """Test that an error event in the build stream fails the build."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+
+    env_info = EnvironmentInfo(env_type="pip", dependencies=[], detected_files=[])
+
+    mock_client = MagicMock()
+    mock_client.api.build.return_value = iter(
+        [{"stream": "Step 1/5"}, {"error": "pip install failed\n"}]
+    )
+    mock_docker_client.return_value = mock_client
+
+    with pytest.raises(DockerBuildError, match="pip install failed"):
+        build_image(repo_path, env_info, job_id="test-job-3")
+    mock_client.api.tag.assert_not_called()
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_build_image_reuses_docker_client(mock_docker_client, tmp_path: Path):
+    """Test that the Docker client is created once and reused across calls."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+
+    env_info = EnvironmentInfo(env_type="pip", dependencies=[], detected_files=[])
+
+    mock_client = MagicMock()
+    mock_client.api.build.side_effect = lambda **kwargs: iter([])
+    mock_docker_client.return_value = mock_client
+
+    build_image(repo_path, env_info, job_id="test-job-4")
+    build_image(repo_path, env_info, job_id="test-job-5")
+
+    mock_docker_client.assert_called_once()
+    assert mock_client.api.build.call_count == 2
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_warm_base_image_pulls_only_missing_image(mock_docker_client):
+    """Test that the base image is pulled only when the daemon lacks it."""
+    mock_client = MagicMock()
+    mock_docker_client.return_value = mock_client
+
+    warm_base_image("python:3.11-slim")
+    mock_client.images.pull.assert_not_called()
+
+    mock_client.images.get.side_effect = ImageNotFound("missing")
+    warm_base_image("python:3.11-slim")
+    mock_client.images.pull.assert_called_once_with("python", tag="3.11-slim")
+
+
+def test_build_slot_limits_concurrent_builds(monkeypatch, tmp_path: Path):
+    """Test that a build waits while every build slot is held."""
+    monkeypatch.setattr(settings, "temp_repos_path", tmp_path / "repos")
+    monkeypatch.setattr(settings, "docker_max_parallel_builds", 1)
+    monkeypatch.setattr("app.worker.docker_builder._BUILD_SLOT_POLL_SECONDS", 0.01)
+
+    entered = threading.Event()
+
+    def second_build():
+        with _build_slot():
+            entered.set()
+
+    with _build_slot():
+        thread = threading.Thread(target=second_build)
+        thread.start()
+        assert not entered.wait(0.2)
+
+    assert entered.wait(5)
+    thread.join()
+
+
+def test_build_slot_closes_file_when_lock_fails(monkeypatch, tmp_path: Path):
+    """Test that a flock error other than a busy slot closes the slot file and propagates."""
+    monkeypatch.setattr(settings, "temp_repos_path", tmp_path / "repos")
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    def failing_flock(file, operation):
+        raise OSError(errno.ENOLCK, "No locks available")
+
+    monkeypatch.setattr(docker_builder, "open", tracking_open, raising=False)
+    monkeypatch.setattr(docker_builder.fcntl, "flock", failing_flock)
+
+    with pytest.raises(OSError, match="No locks available"):
+        with _build_slot():
+            pass
+
+    assert len(opened) == 1
+    assert opened[0].closed
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_build_image_removes_replaced_cache_image(mock_docker_client, tmp_path: Path):
+    """Test that moving the cache tag deletes the old cache image once it is untagged."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+    env_info = EnvironmentInfo(env_type="pip", dependencies=[], detected_files=[])
+
+    mock_client = MagicMock()
+    mock_client.api.build.side_effect = lambda **kwargs: iter([])
+    repo_tags = {"sha256:old": []}
+    mock_client.api.inspect_image.side_effect = lambda ref: (
+        {"Id": "sha256:old"} if ref == "arandu-job-cache:latest" else {"RepoTags": repo_tags[ref]}
+    )
+    mock_docker_client.return_value = mock_client
+
+    build_image(repo_path, env_info, job_id="test-job-8")
+    mock_client.api.remove_image.assert_called_once_with("sha256:old")
+
+    # Still tagged by a running job: left for that job's cleanup
+    mock_client.api.remove_image.reset_mock()
+    repo_tags["sha256:old"] = ["arandu-job-test-job-7:latest"]
+    build_image(repo_path, env_info, job_id="test-job-9")
+    mock_client.api.remove_image.assert_not_called()
+
+
+@patch("app.worker.docker_builder.docker.from_env")
+def test_build_image_ignores_cache_tag_errors(mock_docker_client, tmp_path: Path):
+    """Test that a Docker error while moving the cache tag does not fail the build."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+    env_info = EnvironmentInfo(env_type="pip", dependencies=[], detected_files=[])
+
+    mock_client = MagicMock()
+    mock_client.api.build.side_effect = lambda **kwargs: iter([])
+    mock_client.api.tag.side_effect = DockerException("daemon went away")
+    mock_docker_client.return_value = mock_client
+
+    assert build_image(repo_path, env_info, job_id="test-job-10") == "arandu-job-test-job-10:latest"
+    mock_client.api.remove_image.assert_not_called()
+
+
+def test_forked_child_does_not_inherit_docker_clients():
+    """Test that a forked work-horse creates its own Docker clients instead of the parent's."""
+    from app.worker import executor
+
+    docker_builder._client = executor._client = MagicMock()
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if docker_builder._client is None and executor._client is None else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert docker_builder._client is not None
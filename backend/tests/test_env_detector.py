@@ -8,6 +8,7 @@ from app.utils.errors import NoEnvironmentDetectedError
 from app.worker.env_detector import (
     Dependency,
     EnvironmentInfo,
+    _parse_pip_dependency_string,
     _parse_requirements_txt,
     detect_environment,
 )
@@ -28,6 +29,8 @@ def test_detect_requirements_txt(tmp_path: Path):
     assert any(dep.name == "numpy" and dep.version == "==1.24.0" for dep in env_info.dependencies)
     assert any(dep.name == "torch" and dep.version == ">=2.0.0" for dep in env_info.dependencies)
     assert any(dep.name == "pandas" and dep.version is None for dep in env_info.dependencies)
+    # Dependencies come back in canonical (name) order, not file order
+    assert [dep.name for dep in env_info.dependencies] == ["numpy", "pandas", "torch"]
 
 
 def test_detect_environment_yml(tmp_path: Path):
@@ -65,6 +68,20 @@ def test_detect_pyproject_toml(tmp_path: Path):
     assert len(env_info.dependencies) >= 1
 
 
+def test_detect_skips_non_file_entries(tmp_path: Path):
+    """Test that directories and dangling symlinks are not taken as environment files."""
+    repo_path = tmp_path / "test-repo"
+    repo_path.mkdir()
+    (repo_path / "requirements.txt").mkdir()
+    (repo_path / "environment.yml").symlink_to(tmp_path / "missing.yml")
+    (repo_path / "Pipfile").write_text('[packages]\nrequests = "*"\n')
+
+    env_info = detect_environment(repo_path, job_id="test-job-5")
+
+    assert env_info.type == "pipenv"
+    assert env_info.detected_files == ["Pipfile"]
+
+
 def test_detect_no_environment(tmp_path: Path):
     """Test detection when no environment files exist."""
     repo_path = tmp_path / "test-repo"
@@ -100,6 +117,21 @@ def test_parse_requirements_txt(tmp_path: Path):
     assert deps[3].version is None
 
 
+def test_parse_pip_dependency_string():
+    """Test parsing single pip requirement specs."""
+    cases = {
+        "numpy": ("numpy", None),
+        "numpy >= 1.2": ("numpy", ">=1.2"),
+        "pkg[extra,cuda]==1.0": ("pkg[extra,cuda]", "==1.0"),
+        "scikit-learn<2,>=1.3": ("scikit-learn", "<2,>=1.3"),
+        "torch>2": ("torch", ">2"),
+        "git+https://github.com/org/repo.git": ("git+https://github.com/org/repo.git", None),
+    }
+    for spec, expected in cases.items():
+        dep = _parse_pip_dependency_string(spec)
+        assert (dep.name, dep.version) == expected
+
+
 def test_environment_info_to_dict():
     """Test EnvironmentInfo.to_dict()."""
     deps = [Dependency("numpy", "1.24.0"), Dependency("pandas")]
@@ -6,7 +6,13 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from app.utils.errors import ExecutionError, ExecutionTimeoutError
-from app.worker.executor import ExecutionResult, _parse_memory_limit, _truncate_log, execute_command
+from app.worker.executor import (
+    ExecutionResult,
+    _parse_memory_limit,
+    _truncate_log,
+    execute_command,
+    validate_security_settings,
+)
 
 
 def test_parse_memory_limit():
@@ -17,6 +23,27 @@ def test_parse_memory_limit():
     assert _parse_memory_limit("1024") == 1024
 
 
+def test_validate_security_settings():
+    """Test that validated settings are turned into container limits."""
+    with patch("app.worker.executor.settings") as mock_settings:
+        mock_settings.docker_user = "arandu-user"
+        mock_settings.docker_user_uid = 1000
+        mock_settings.docker_cpu_limit = 1.5
+        mock_settings.docker_memory_limit = "512m"
+        mock_settings.docker_network_mode = "none"
+        mock_settings.docker_readonly_rootfs = True
+
+        constraints = validate_security_settings()
+        assert constraints.user == "arandu-user"
+        assert constraints.cpu_quota == 1_500_000_000
+        assert constraints.mem_limit == 512 * 1024 * 1024
+        assert constraints.read_only is True
+
+        mock_settings.docker_user_uid = 0
+        with pytest.raises(ExecutionError, match="non-root user"):
+            validate_security_settings()
+
+
 def test_truncate_log():
     """Test log truncation."""
     short_log = "Short log"
@@ -28,6 +55,15 @@ def test_truncate_log():
     assert len(truncated.encode("utf-8")) <= 100 + len(b"\n... [truncated]")
     assert "[truncated]" in truncated
 
+    # A multi-byte character split at the limit is dropped, not broken
+    assert _truncate_log("ab€cd", 4) == "ab\n... [truncated]"
+    assert _truncate_log("ab€cd", 5) == "ab€\n... [truncated]"
+
+    # Empty logs and a zero budget return without encoding
+    assert _truncate_log("", 0) == ""
+    assert _truncate_log("abc", 0) == "\n... [truncated]"
+    assert _truncate_log("abc", -1) == "\n... [truncated]"
+
 
 @patch("app.worker.executor.docker.from_env")
 def test_execute_command_success(mock_docker_client, tmp_path: Path):
@@ -42,10 +78,9 @@ def test_execute_command_success(mock_docker_client, tmp_path: Path):
     mock_client = MagicMock()
     mock_container = MagicMock()
     mock_container.wait.return_value = {"StatusCode": 0}
-    mock_container.logs.side_effect = [
-        b"stdout output",
-        b"stderr output",
-    ]
+    mock_container.logs.side_effect = lambda stdout, **kwargs: (
+        iter([b"stdout ", b"output"]) if stdout else iter([b"stderr output"])
+    )
     mock_client.containers.run.return_value = mock_container
     mock_docker_client.return_value = mock_client
 
@@ -65,7 +100,9 @@ def test_execute_command_success(mock_docker_client, tmp_path: Path):
     assert result.stderr == "stderr output"
     assert result.duration_seconds > 0
     assert result.logs_path is not None
-    assert result.logs_path.exists()
+    assert result.logs_path.read_text(encoding="utf-8") == (
+        "=== STDOUT ===\nstdout output\n=== STDERR ===\nstderr output"
+    )
 
     # Verify security constraints were applied
     mock_client.containers.run.assert_called_once()
@@ -74,6 +111,7 @@ def test_execute_command_success(mock_docker_client, tmp_path: Path):
     assert call_kwargs["network_mode"] == "none"
     assert "cpu_quota" in call_kwargs
     assert "mem_limit" in call_kwargs
+    mock_container.wait.assert_called_once_with(timeout=60, condition="not-running")
 
 
 @patch("app.worker.executor.docker.from_env")
@@ -111,6 +149,100 @@ def test_execute_command_timeout(mock_docker_client, tmp_path: Path):
         )
 
 
+@patch("app.worker.executor.docker.from_env")
+def test_execute_command_reads_logs_while_running(mock_docker_client, tmp_path: Path):
+    """Test that both log streams are followed before the container exits."""
+    import threading
+
+    streams_opened = threading.Semaphore(0)
+    exited = threading.Event()
+
+    def follow_logs(stdout, **kwargs):
+        streams_opened.release()
+        yield b"out" if stdout else b"err"
+        exited.wait(5)
+
+    def wait_for_exit(**kwargs):
+        # Only exits once both streams are being followed
+        assert streams_opened.acquire(timeout=5) and streams_opened.acquire(timeout=5)
+        exited.set()
+        return {"StatusCode": 0}
+
+    mock_client = MagicMock()
+    mock_container = MagicMock()
+    mock_container.logs.side_effect = follow_logs
+    mock_container.wait.side_effect = wait_for_exit
+    mock_client.containers.run.return_value = mock_container
+    mock_docker_client.return_value = mock_client
+
+    result = execute_command(
+        image_tag="test-image:latest",
+        command="python main.py",
+        repo_path=tmp_path / "repo",
+        artifacts_dir=tmp_path / "artifacts",
+        job_id="test-job-4",
+        timeout_seconds=60,
+    )
+
+    assert result.stdout == "out"
+    assert result.stderr == "err"
+    assert result.logs_path.read_bytes() == b"=== STDOUT ===\nout\n=== STDERR ===\nerr"
+
+
+@patch("app.worker.executor.docker.from_env")
+def test_execute_command_closes_logs_when_container_cannot_be_stopped(
+    mock_docker_client, tmp_path: Path
+):
+    """Test that a failed wait does not hang on log streams of a container that keeps running."""
+    import threading
+
+    from docker.errors import APIError
+
+    class FollowedStream:
+        """Log stream that only ends when closed, like a running container's."""
+
+        def __init__(self):
+            self.closed = threading.Event()
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            self.closed.wait(5)
+            raise StopIteration
+
+        def close(self):
+            self.closed.set()
+
+    streams = []
+
+    def follow_logs(**kwargs):
+        streams.append(FollowedStream())
+        return streams[-1]
+
+    mock_client = MagicMock()
+    mock_container = MagicMock()
+    mock_container.logs.side_effect = follow_logs
+    mock_container.wait.side_effect = RuntimeError("connection reset")
+    mock_container.stop.side_effect = APIError("stop failed")
+    mock_container.kill.side_effect = APIError("kill failed")
+    mock_client.containers.run.return_value = mock_container
+    mock_docker_client.return_value = mock_client
+
+    with pytest.raises(ExecutionError, match="connection reset"):
+        execute_command(
+            image_tag="test-image:latest",
+            command="python main.py",
+            repo_path=tmp_path / "repo",
+            artifacts_dir=tmp_path / "artifacts",
+            job_id="test-job-5",
+            timeout_seconds=60,
+        )
+
+    assert len(streams) == 2
+    assert all(stream.closed.is_set() for stream in streams)
+
+
 @patch("app.worker.executor.docker.from_env")
 def test_execute_command_container_error(mock_docker_client, tmp_path: Path):
     """Test container error handling."""
@@ -138,3 +270,18 @@ def test_execute_command_container_error(mock_docker_client, tmp_path: Path):
             artifacts_dir=artifacts_dir,
             job_id="test-job-3",
         )
+
+
+def test_stream_logs_keeps_only_head(tmp_path: Path):
+    """Test that log streaming writes raw bytes but keeps only a head in memory."""
+    import io
+
+    from app.worker.executor import _stream_logs
+
+    log_out = io.BytesIO()
+
+    head = _stream_logs(iter([b"x" * 100] * 50 + [b"\xe2\x82"]), log_out, 150)
+
+    assert log_out.getvalue() == b"x" * 5000 + b"\xe2\x82"
+    assert len(head) == 200
+    assert _truncate_log(head, 150) == "x" * 150 + "\n... [truncated]"
@@ -0,0 +1,81 @@
+"""Tests for Quality Score feature builder."""
+
+from pathlib import Path
+
+import pytest
+
+from app.worker.claim_extractor import Claim
+from app.worker.quality.feature_builder import (
+    extract_citation_features,
+    extract_paper_features,
+    extract_repo_features,
+)
+
+
+def test_extract_paper_features_signals():
+    """Test case-insensitive detection of paper signals, including whitespace-separated phrases."""
+    features = extract_paper_features(
+        [], "Our ABLATION study, Compared\nto prior work, reports Standard  Deviation."
+    )
+
+    assert features["has_ablation"] is True
+    assert features["has_baselines"] is True
+    assert features["has_error_bars"] is True
+    assert features["has_seeds"] is False
+    assert extract_paper_features([], "We fix Random_State=0.")["has_seeds"] is True
+
+
+def test_extract_repo_features_finds_nested_test_file(tmp_path: Path):
+    """Test that test files are found at any depth, but not inside skipped directories."""
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "test_site.py").write_text("")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "test_pkg.py").write_text("")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "model.py").write_text("")
+
+    assert extract_repo_features(tmp_path)["has_tests"] is False
+
+    (tmp_path / "src" / "pkg" / "test_model.py").write_text("")
+
+    assert extract_repo_features(tmp_path)["has_tests"] is True
+
+
+def test_extract_repo_features_versions_pinned(tmp_path: Path):
+    """Test that versions_pinned is the share of pinned requirement lines."""
+    (tmp_path / "requirements.txt").write_text(
+        "# core\n"
+        "--index-url https://user@example.com/simple\n"
+        "numpy==1.24.0\n"
+        "\n"
+        "mylib @ git+https://github.com/example/mylib@v1.0\n"
+        "pandas>=2.0\n"
+        "scipy"
+    )
+
+    assert extract_repo_features(tmp_path)["versions_pinned"] == 0.5
+
+
+def test_extract_citation_features_diversity():
+    """Test that citation diversity averages unique venue and first-author ratios."""
+    claims = [
+        Claim(id="c1", text="We improve accuracy.", section="results", spans=[]),
+        Claim(id="c2", text="We reduce latency.", section="results", spans=[]),
+    ]
+    citations_by_claim = {
+        "c1": [
+            {"venue": "NeurIPS", "authors": ["Smith", "Lee"], "score_final": 0.8},
+            {"venue": "neurips", "authors": ["Jones"], "score_rerank": 0.4},
+        ],
+        "c2": [
+            {"venue": "ICML", "authors": ["Smith"], "score_final": 0.6},
+            {"venue": None, "authors": [], "score_final": 0.2},
+        ],
+    }
+
+    features = extract_citation_features(citations_by_claim, claims)
+
+    assert features["citation_coverage"] == 1.0
+    assert features["avg_citation_relevance"] == pytest.approx(0.5)
+    assert features["citation_diversity"] == (3 + 3) / 8
+    assert extract_citation_features({}, claims)["citation_diversity"] == 0.0
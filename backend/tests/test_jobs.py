@@ -120,3 +120,64 @@ def test_get_job_status(client, db_session):
     data = response.json()
     assert data["job_id"] == job_id
     assert data["status"] == "pending"
+
+
+def test_process_job_skips_claimed_job(db_session):
+    """Test that the worker does not rerun a job that is no longer pending."""
+    from unittest.mock import patch
+    from uuid import uuid4
+
+    from app.models.job import Job, JobStatus
+    from app.worker.main import process_job
+
+    job = Job(
+        id=uuid4(),
+        repo_url="https://github.com/testuser/testrepo",
+        status=JobStatus.RUNNING,
+    )
+    db_session.add(job)
+    db_session.commit()
+    job_id = job.id
+
+    with (
+        patch("app.worker.main.SessionLocal", return_value=db_session),
+        patch("app.worker.main.clone_repo") as mock_clone,
+    ):
+        process_job(str(job_id))
+
+    mock_clone.assert_not_called()
+    assert db_session.get(Job, job_id).status == JobStatus.RUNNING
+
+
+def test_process_job_reclaims_abandoned_running_job(db_session):
+    """Test that a job left running past the RQ job timeout is processed again."""
+    from datetime import UTC, datetime, timedelta
+    from unittest.mock import patch
+    from uuid import uuid4
+
+    from app.models.job import Job, JobStatus
+    from app.utils.errors import RepoCloneError
+    from app.worker.main import process_job
+    from app.worker.tasks import JOB_TIMEOUT_SECONDS
+
+    stale = datetime.now(UTC) - timedelta(seconds=JOB_TIMEOUT_SECONDS + 60)
+    job = Job(
+        id=uuid4(),
+        repo_url="https://github.com/testuser/testrepo",
+        status=JobStatus.RUNNING,
+        updated_at=stale,
+    )
+    db_session.add(job)
+    db_session.commit()
+    job_id = job.id
+
+    with (
+        patch("app.worker.main.SessionLocal", return_value=db_session),
+        patch(
+            "app.worker.main.clone_repo", side_effect=RepoCloneError("clone failed")
+        ) as mock_clone,
+    ):
+        process_job(str(job_id))
+
+    mock_clone.assert_called_once()
+    assert db_session.get(Job, job_id).status == JobStatus.FAILED
@@ -5,7 +5,7 @@ import os
 import pytest
 from unittest.mock import patch
 
-from app.worker.llm_client import generate_text, get_llm_client
+from app.worker.llm_client import generate_text, get_llm_client, strip_code_fence
 
 
 def pytest_configure(config):
@@ -74,3 +74,25 @@ def test_llm_client_fallback_when_no_key():
         response = generate_text("test")
         assert response is None
 
+
+def test_llm_client_reused_until_settings_change():
+    """Test that the client is created once and rebuilt when its settings change."""
+    with patch("app.worker.llm_client.settings") as mock_settings, patch(
+        "app.worker.llm_client._create_llm_client", side_effect=lambda: object()
+    ) as mock_create:
+        mock_settings.gemini_api_key = "key-1"
+        first = get_llm_client()
+        assert get_llm_client() is first
+        assert mock_create.call_count == 1
+
+        mock_settings.gemini_api_key = "key-2"
+        assert get_llm_client() is not first
+        assert mock_create.call_count == 2
+
+
+def test_strip_code_fence():
+    """Test removal of markdown code fences around LLM JSON output."""
+    assert strip_code_fence('```json\n{"a": 1}\n```') == '{"a": 1}'
+    assert strip_code_fence('  ```\n{"a": 1}```  ') == '{"a": 1}'
+    assert strip_code_fence('{"a": 1}\n```') == '{"a": 1}'
+    assert strip_code_fence('{"a": 1}') == '{"a": 1}'
@@ -1,7 +1,14 @@
 """Tests for metrics collection."""
 
+from unittest.mock import patch
 
-from app.utils.metrics import ReviewMetrics, get_metrics_summary, record_review_metrics, reset_metrics
+from app.utils.metrics import (
+    ReviewMetrics,
+    get_metrics_summary,
+    record_review_metrics,
+    record_step_time,
+    reset_metrics,
+)
 
 
 def test_record_review_metrics():
@@ -26,9 +33,38 @@ def test_record_review_metrics():
     assert summary["checklist_pass_rate"]["avg"] == 0.7
 
 
+def test_record_step_time_summary():
+    """Test per-step averages in the summary."""
+    reset_metrics()
+
+    record_step_time("ingestion", 1.0)
+    record_step_time("ingestion", 3.0)
+    record_step_time("claim_extraction", 0.5)
+
+    summary = get_metrics_summary()
+    assert summary["steps"] == {
+        "ingestion": {"avg_time_seconds": 2.0, "count": 2},
+        "claim_extraction": {"avg_time_seconds": 0.5, "count": 1},
+    }
+
+    record_step_time("ingestion", 5.0)
+    assert get_metrics_summary()["steps"]["ingestion"] == {"avg_time_seconds": 3.0, "count": 3}
+
+
 def test_get_metrics_summary_empty():
     """Test metrics summary when no metrics recorded."""
     reset_metrics()
     summary = get_metrics_summary()
     assert "reviews" not in summary or summary.get("reviews", {}).get("total", 0) == 0
 
+
+def test_metrics_disabled_skips_recording():
+    """Test that recorders are no-ops when metrics are disabled."""
+    reset_metrics()
+
+    with patch("app.utils.metrics.settings") as mock_settings:
+        mock_settings.metrics_enabled = False
+        record_step_time("ingestion", 1.0)
+        record_review_metrics(ReviewMetrics(review_id="test-2", total_time=2.0))
+
+    assert get_metrics_summary() == {}
@@ -0,0 +1,31 @@
+"""Tests for Quality Score predictor."""
+
+import os
+import pickle
+from pathlib import Path
+
+from app.config import settings
+from app.worker.quality import predictor
+
+
+def test_load_model_reloads_only_when_file_changes(tmp_path: Path, monkeypatch):
+    """Test that the model is unpickled once and reloaded after the file is replaced."""
+    monkeypatch.setattr(settings, "artifacts_base_path", tmp_path)
+    predictor._load_model_file.cache_clear()
+
+    assert predictor.load_model() is None
+    assert predictor.predict_quality_score({})["model_type"] == "baseline"
+
+    model_path = predictor.get_model_path()
+    model_path.write_bytes(pickle.dumps({"weights": [1]}))
+    os.utime(model_path, ns=(1, 1))
+
+    first = predictor.load_model()
+    assert first == {"weights": [1]}
+    assert predictor.load_model() is first
+
+    model_path.write_bytes(pickle.dumps({"weights": [2]}))
+    os.utime(model_path, ns=(2, 2))
+
+    assert predictor.load_model() == {"weights": [2]}
+    predictor._load_model_file.cache_clear()
@@ -89,3 +89,26 @@ def test_reranker():
     assert len(reranked) <= 2
     assert all(isinstance(item, tuple) and len(item) == 2 for item in reranked)
 
+
+@pytest.mark.skipif(
+    not hasattr(__import__("sentence_transformers", fromlist=[""]), "CrossEncoder"),
+    reason="sentence-transformers CrossEncoder not available",
+)
+def test_reranker_falls_back_to_torch_without_backend_support(monkeypatch):
+    """Test that a CrossEncoder without backend support loads the torch model instead."""
+    import sentence_transformers
+
+    from app.worker.rag import reranker
+
+    loaded = []
+
+    class OldCrossEncoder:
+        def __init__(self, model_name):
+            loaded.append(model_name)
+
+    monkeypatch.setattr(sentence_transformers, "CrossEncoder", OldCrossEncoder)
+    monkeypatch.setattr(reranker, "_model", None)
+    monkeypatch.setattr(reranker.settings, "rag_reranker_backend", "onnx")
+
+    assert isinstance(reranker.get_reranker_model(), OldCrossEncoder)
+    assert loaded == ["cross-encoder/ms-marco-MiniLM-L-6-v2"]
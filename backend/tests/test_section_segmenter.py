@@ -1,7 +1,7 @@
 """Tests for section segmentation."""
 
 
-from app.worker.section_segmenter import get_section_text, segment_paper
+from app.worker.section_segmenter import get_section_text, has_sections, segment_paper
 
 
 def test_segment_paper_finds_sections():
@@ -72,3 +72,34 @@ def test_section_has_spans():
         assert section.end > section.start
         assert len(section.text) > 0
 
+
+def test_segment_paper_keep_filters_sections():
+    """Test that keep returns only the requested sections, with unchanged offsets."""
+    text = """
+    Abstract
+    Abstract content here.
+
+    Results
+    Results content here.
+
+    Appendix
+    Appendix content here.
+    """
+    kept = segment_paper(text, keep={"results"})
+
+    assert kept == [s for s in segment_paper(text) if s.name == "results"]
+    assert text[kept[0].start : kept[0].end] == kept[0].text
+    assert segment_paper(text, keep={"method"}) == []
+
+
+def test_has_sections_matches_segment_paper():
+    """Test that has_sections agrees with whether segment_paper finds any section."""
+    texts = [
+        "Introduction\nIntro text.",
+        "   4. Results  \nResults text.",
+        "Some text without sections.",
+        "Related\nWork is split over two lines.",
+        "",
+    ]
+    for text in texts:
+        assert has_sections(text) == bool(segment_paper(text))
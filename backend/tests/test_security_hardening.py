@@ -141,7 +141,7 @@ def test_executor_enforces_readonly_rootfs(tmp_path):
         mock_docker.from_env.return_value = mock_client
         mock_container = Mock()
         mock_container.wait.return_value = {"StatusCode": 0}
-        mock_container.logs.return_value = b"test output"
+        mock_container.logs.side_effect = lambda **kwargs: iter([b"test output"])
         mock_client.containers.run.return_value = mock_container
 
         # Mock time module to avoid comparison issues with timeout check